@@ -1,16 +1,69 @@
+import json
+import math
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
 from Assignment3 import bellman_ford, greedy_best_first_search
 
-def compare_algorithms(graph, start, goal, positions):
-    # Run GBFS (only if positions are available)
+
+def compare_algorithms_report(graph, start, goal, positions, instrumentation=None):
+    """
+    Run GBFS and Bellman-Ford and return the results as a dict
+    (machine readable version of compare_algorithms).
+
+    Returns None if the position data is missing or incomplete.
+    """
     if not positions or start not in positions or goal not in positions:
+        return None
+
+    result_gbfs = greedy_best_first_search(graph, start, goal, positions, instrumentation)
+    result_bf   = bellman_ford(graph, start, goal, instrumentation)
+
+    return {
+        "start": start,
+        "goal": goal,
+        "gbfs": {
+            "time_ms": result_gbfs["time"],
+            "path": result_gbfs["path"],
+            "metrics": result_gbfs["metrics"],
+        },
+        "bellman_ford": {
+            "time_ms": result_bf["time"],
+            "cost": result_bf["cost"],
+            "path": result_bf["path"],
+            "metrics": result_bf["metrics"],
+        },
+    }
+
+
+def _json_safe(value):
+    """
+    Copy of value with inf / nan (e.g. the Bellman-Ford cost of an unreachable
+    goal) replaced by None, which JSON can represent.
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+def compare_algorithms(graph, start, goal, positions, instrumentation=None, as_json=False):
+    # Run GBFS (only if positions are available)
+    report = compare_algorithms_report(graph, start, goal, positions, instrumentation)
+    if report is None:
         return "Error: Position data missing or incomplete for Greedy Best-First Search."
+    if as_json:
+        return json.dumps(_json_safe(report), allow_nan=False)
 
-    result_gbfs = greedy_best_first_search(graph, start, goal, positions)
-    result_bf   = bellman_ford(graph, start, goal)
+    result_gbfs = report["gbfs"]
+    result_bf   = report["bellman_ford"]
 
     # Format times
-    gbfs_time = int(round(result_gbfs["time"]))
-    bf_time   = int(round(result_bf["time"]))
+    gbfs_time = f"{result_gbfs['time_ms']:.3f}"
+    bf_time   = f"{result_bf['time_ms']:.3f}"
 
     # Format paths
     gbfs_path = ", ".join(result_gbfs["path"]) if result_gbfs["path"] else "None"
@@ -29,3 +82,157 @@ def compare_algorithms(graph, start, goal, positions):
     output += f"Bellman-Ford    {bf_metrics.get('g.cost', 0):<10} -         -\n"
 
     return output
+
+
+def summarize_times(times):
+    """
+    min / median / stddev (milliseconds) of a list of run times in milliseconds.
+    """
+    return {
+        "runs": len(times),
+        "min_ms": min(times),
+        "median_ms": statistics.median(times),
+        "stddev_ms": statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def run_pair_trials(graph, start, goal, positions, trials=5, warmup=1):
+    """
+    Run GBFS and Bellman-Ford `warmup` + `trials` times for one start/goal pair.
+
+    Returns a dict like compare_algorithms_report, where each algorithm's
+    "time_ms" is replaced by a "times" summary (see summarize_times).
+    Counters and paths come from the last run (the algorithms are deterministic).
+    """
+    return _pair_report(start, goal, *_pair_times(graph, start, goal, positions, trials, warmup))
+
+
+def _pair_times(graph, start, goal, positions, trials, warmup):
+    """
+    The timed runs of run_pair_trials: (GBFS times, Bellman-Ford times,
+    last GBFS result, last Bellman-Ford result).
+    """
+    for _ in range(warmup):
+        greedy_best_first_search(graph, start, goal, positions)
+        bellman_ford(graph, start, goal)
+
+    gbfs_times = []
+    bf_times = []
+    for _ in range(trials):
+        result_gbfs = greedy_best_first_search(graph, start, goal, positions)
+        gbfs_times.append(result_gbfs["time"])
+        result_bf = bellman_ford(graph, start, goal)
+        bf_times.append(result_bf["time"])
+    return gbfs_times, bf_times, result_gbfs, result_bf
+
+
+def _pair_report(start, goal, gbfs_times, bf_times, result_gbfs, result_bf):
+    return {
+        "start": start,
+        "goal": goal,
+        "gbfs": {
+            "times": summarize_times(gbfs_times),
+            "path": result_gbfs["path"],
+            "metrics": result_gbfs["metrics"],
+        },
+        "bellman_ford": {
+            "times": summarize_times(bf_times),
+            "cost": result_bf["cost"],
+            "path": result_bf["path"],
+            "metrics": result_bf["metrics"],
+        },
+    }
+
+
+# Graph and positions of a worker process, set once by _init_worker so they
+# are pickled once per worker instead of once per task.
+_worker_data = {}
+
+
+def _init_worker(graph, positions):
+    _worker_data["graph"] = graph
+    _worker_data["positions"] = positions
+
+
+def _worker_pair_trials(start, goal, trials, warmup):
+    return run_pair_trials(_worker_data["graph"], start, goal, _worker_data["positions"], trials, warmup)
+
+
+def _worker_pair_times(start, goal, trials, warmup):
+    return _pair_times(_worker_data["graph"], start, goal, _worker_data["positions"], trials, warmup)
+
+
+def compare_algorithms_trials(graph, pairs, positions, trials=5, warmup=1, workers=0):
+    """
+    Compare GBFS and Bellman-Ford over many (start, goal) pairs, running each
+    algorithm `trials` times (after `warmup` untimed runs) per pair.
+
+    If workers > 0 the pairs are spread over that many worker processes; with
+    a single pair its trials are split between the workers instead (each
+    worker does its own warmup runs).
+    Note that timings measured in parallel share the CPU with the other
+    workers, so use workers=0 when comparing absolute times.
+
+    Returns a list with one run_pair_trials dict per pair (same order as
+    `pairs`). Pairs with missing positions get {"start", "goal", "error"}.
+    """
+    if trials < 1:
+        raise ValueError("Number of trials must be at least 1.")
+    results = [None] * len(pairs)
+    todo = []
+    for i, (start, goal) in enumerate(pairs):
+        if not positions or start not in positions or goal not in positions:
+            results[i] = {"start": start, "goal": goal,
+                          "error": "Position data missing or incomplete for Greedy Best-First Search."}
+        elif start not in graph.out_adj_list or goal not in graph.out_adj_list:
+            results[i] = {"start": start, "goal": goal, "error": "Vertex does not exist."}
+        else:
+            todo.append(i)
+
+    if workers and workers > 0 and len(todo) == 1 and trials > 1:
+        i = todo[0]
+        start, goal = pairs[i]
+        chunks = [trials // workers + (1 if k < trials % workers else 0) for k in range(min(workers, trials))]
+        with ProcessPoolExecutor(max_workers=len(chunks), initializer=_init_worker,
+                                 initargs=(graph, positions)) as pool:
+            parts = [future.result() for future in
+                     [pool.submit(_worker_pair_times, start, goal, n, warmup) for n in chunks]]
+        gbfs_times = [t for part in parts for t in part[0]]
+        bf_times = [t for part in parts for t in part[1]]
+        results[i] = _pair_report(start, goal, gbfs_times, bf_times, parts[-1][2], parts[-1][3])
+    elif workers and workers > 0 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(graph, positions)) as pool:
+            futures = {i: pool.submit(_worker_pair_trials, pairs[i][0], pairs[i][1], trials, warmup)
+                       for i in todo}
+            for i, future in futures.items():
+                results[i] = future.result()
+    else:
+        for i in todo:
+            results[i] = run_pair_trials(graph, pairs[i][0], pairs[i][1], positions, trials, warmup)
+    return results
+
+
+def format_trials_report(results):
+    """
+    Format the result of compare_algorithms_trials as a table.
+    """
+    output = "                          min(ms)   median(ms)  stddev(ms)  h.calcs/g.cost  pq.push  pq.pop\n"
+    for result in results:
+        output += f"{result['start']} -> {result['goal']}:\n"
+        if "error" in result:
+            output += f"  Error: {result['error']}\n"
+            continue
+        gbfs = result["gbfs"]
+        bf = result["bellman_ford"]
+        gbfs_path = ", ".join(gbfs["path"]) if gbfs["path"] else "None"
+        bf_path = ", ".join(bf["path"]) if bf["path"] else "None"
+        t = gbfs["times"]
+        m = gbfs["metrics"]
+        output += (f"  Greedy BFS            {t['min_ms']:<9.3f} {t['median_ms']:<11.3f} {t['stddev_ms']:<11.3f} "
+                   f"{m.get('h.calculations', 0):<15} {m.get('pq.push', 0):<8} {m.get('pq.pop', 0)}\n")
+        t = bf["times"]
+        output += (f"  Bellman-Ford          {t['min_ms']:<9.3f} {t['median_ms']:<11.3f} {t['stddev_ms']:<11.3f} "
+                   f"{bf['metrics'].get('g.cost', 0):<15} -        -\n")
+        output += f"  paths: GBFS [{gbfs_path}], Bellman-Ford [{bf_path}] cost {bf['cost']}\n"
+    return output
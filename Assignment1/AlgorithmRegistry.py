@@ -0,0 +1,114 @@
+"""
+Registry of the algorithms available to main.py and batch mode.
+
+Every algorithm is declared by name together with the module and attribute
+that implement it; the module is only imported the first time the algorithm
+is asked for, so starting the program does not pay for modules it never uses.
+
+    bfs = get("bfs")            # imports Lab01 now (if not imported yet)
+    for vertex, dist in bfs(g, "A"):
+        ...
+
+New engines are added with register(name, module, attribute), as done at
+the end of this module.
+
+Benchmark.py --startup measures the effect on the start-up time of main.py.
+"""
+
+import importlib
+
+
+class AlgorithmEntry:
+    """
+    One registered algorithm: where it lives and, once loaded, the object.
+    """
+
+    __slots__ = ("name", "module", "attribute", "description", "_value")
+
+    def __init__(self, name, module, attribute, description=""):
+        self.name = name
+        self.module = module
+        self.attribute = attribute
+        self.description = description
+        self._value = None
+
+    @property
+    def loaded(self):
+        return self._value is not None
+
+    def load(self):
+        """
+        Import the module (first use only) and return the algorithm.
+        """
+        if self._value is None:
+            module = importlib.import_module(self.module)
+            try:
+                self._value = getattr(module, self.attribute)
+            except AttributeError:
+                raise ValueError(f"Module '{self.module}' has no '{self.attribute}' "
+                                 f"(algorithm '{self.name}').")
+        return self._value
+
+
+ALGORITHMS = {}
+
+
+def register(name, module, attribute, description=""):
+    """
+    Declare an algorithm. Nothing is imported until get(name) is called.
+    """
+    if name in ALGORITHMS:
+        raise ValueError(f"Algorithm '{name}' is already registered.")
+    ALGORITHMS[name] = AlgorithmEntry(name, module, attribute, description)
+
+
+def get(name):
+    """
+    Return the algorithm registered under name, importing its module on
+    first use.
+
+    Time complexity: O(1) after the first call
+    """
+    entry = ALGORITHMS.get(name)
+    if entry is None:
+        raise ValueError(f"Unknown algorithm '{name}'.")
+    return entry.load()
+
+
+def names():
+    return list(ALGORITHMS)
+
+
+def is_loaded(name):
+    return name in ALGORITHMS and ALGORITHMS[name].loaded
+
+
+def load_all():
+    """
+    Import every registered algorithm (what the old eager imports did).
+    """
+    for entry in ALGORITHMS.values():
+        entry.load()
+
+
+register("bfs", "Lab01", "BFSIterator", "breadth first traversal")
+register("dfs", "Lab01", "DFSIterator", "depth first traversal")
+register("gbfs", "Assignment3", "greedy_best_first_search", "greedy best-first search")
+register("bellman_ford", "Assignment3", "bellman_ford", "Bellman-Ford shortest path")
+register("mst", "Assignment4", "kruskal_mst", "Kruskal minimum spanning tree")
+register("count_leaves", "Assignment4", "count_leaf_nodes", "leaves of a tree from a root")
+register("mst_leaves", "Assignment4", "mst_leaf_count_kruskal", "leaves of the MST from a root")
+register("maintained_mst", "DynamicMST", "MaintainedMST", "MST kept up to date under edits")
+register("homeomorphism", "Assignment5", "is_homeomorphic_to_complete_or_bipartite",
+         "homeomorphic to a complete or complete bipartite graph")
+register("hamiltonian", "Assignment6", "find_hamiltonian_cycle", "Hamiltonian cycle (backtracking)")
+register("hamiltonian_report", "Assignment6", "Hamiltonian", "find and print a Hamiltonian cycle")
+register("compare", "AlgorithmComparison", "compare_algorithms", "GBFS vs Bellman-Ford, one run")
+register("compare_trials", "AlgorithmComparison", "compare_algorithms_trials",
+         "GBFS vs Bellman-Ford, repeated trials")
+register("format_trials", "AlgorithmComparison", "format_trials_report", "report of compare_trials")
+register("pagerank", "SparseAnalytics", "pagerank", "PageRank scores")
+register("degree_histogram", "SparseAnalytics", "degree_histogram", "number of vertices per degree")
+register("degree_stats", "SparseAnalytics", "degree_stats", "min / max / mean / median degree")
+register("core_numbers", "SparseAnalytics", "core_numbers", "k-core decomposition")
+register("k_core", "SparseAnalytics", "k_core", "vertices of the k-core")
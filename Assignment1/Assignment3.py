@@ -2,6 +2,7 @@ import heapq
 import time
 import math
 from Lab01 import Graph
+from Instrumentation import get_instrumentation
 
 def euclidean_distance(p1, p2):
     x1, y1 = p1
@@ -9,7 +10,12 @@ def euclidean_distance(p1, p2):
     return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
 
 
-def greedy_best_first_search(graph, start, goal, positions):
+GBFS_MODES = ("greedy", "weighted_astar", "beam")
+
+
+def greedy_best_first_search(graph, start, goal, positions, instrumentation=None,
+                             mode="greedy", epsilon=1.0, beam_width=None,
+                             max_expansions=None, time_limit_ms=None):
     """
     Greedy Best-First Search using Euclidean heuristic from positions.
 
@@ -17,49 +23,98 @@ def greedy_best_first_search(graph, start, goal, positions):
         graph: Graph object
         start, goal: vertex identifiers
         positions: dict of vertex → (x, y) position
+        instrumentation: optional Instrumentation, receives the counters as "gbfs.*"
+        mode: "greedy" orders the frontier by h (the default),
+              "weighted_astar" by g + epsilon * h (epsilon = 1 is plain A*),
+              "beam" like greedy but keeps only the beam_width best frontier entries
+        max_expansions, time_limit_ms: optional budget; when it runs out the
+              search stops and returns the best partial result so far
 
     Returns:
             "path": list of vertices or None,
             "time": ms,
-            "metrics": { "h.calculations": count, "pq.push": count, "pq.pop": count }
+            "metrics": { "h.calculations": count, "pq.push": count, "pq.pop": count,
+                         "expansions": count, "budget.exhausted": 0 or 1,
+                         "best.h": h of the expanded vertex closest to the goal,
+                         "beam.pruned": count (beam mode only) }
+        plus "cost" (weighted_astar, when a path is found) and "partial_path",
+        the path to the expanded vertex closest to the goal (when no path is found).
     """
-    start_time = time.time()
-
+    if mode not in GBFS_MODES:
+        raise ValueError(f"Unknown search mode '{mode}'.")
+    if mode == "weighted_astar" and epsilon < 0:
+        raise ValueError("epsilon must not be negative.")
+    if mode == "beam" and (beam_width is None or beam_width < 1):
+        raise ValueError("Beam search needs beam_width >= 1.")
+    inst = get_instrumentation(instrumentation)
+    start_time = time.perf_counter_ns()
+    deadline = None if time_limit_ms is None else start_time + int(time_limit_ms * 1e6)
+    astar = mode == "weighted_astar"
+
+    goal_position = positions[goal]
+    h = euclidean_distance(positions[start], goal_position)
+    # (priority, vertex, path, g, h)
     frontier = []
-    heapq.heappush(frontier, (euclidean_distance(positions[start], positions[goal]), start, [start]))
+    heapq.heappush(frontier, (epsilon * h if astar else h, start, [start], 0, h))
 
     visited = set()
-    counters = {"h.calculations": 1, "pq.push": 1, "pq.pop": 0}
+    counters = {"h.calculations": 1, "pq.push": 1, "pq.pop": 0,
+                "expansions": 0, "budget.exhausted": 0, "best.h": h}
+    if mode == "beam":
+        counters["beam.pruned"] = 0
+    best_path = [start]
+    found = None
 
     while frontier:
-        heuristic, current, path = heapq.heappop(frontier)
+        _, current, path, cost, h = heapq.heappop(frontier)
         counters["pq.pop"] += 1
 
         if current == goal:
-            return {
-                "path": path,
-                "time": (time.time() - start_time) * 1000,
-                "metrics": counters
-            }
+            found = path
+            break
 
         if current in visited:
             continue
+        if ((max_expansions is not None and counters["expansions"] >= max_expansions)
+                or (deadline is not None and time.perf_counter_ns() >= deadline)):
+            counters["budget.exhausted"] = 1
+            break
         visited.add(current)
+        counters["expansions"] += 1
+        if h < counters["best.h"]:
+            counters["best.h"] = h
+            best_path = path
 
         for neighbor in graph.out_adj_list[current]:
             if neighbor not in visited:
-                h = euclidean_distance(positions[neighbor], positions[goal])
+                h = euclidean_distance(positions[neighbor], goal_position)
                 counters["h.calculations"] += 1
-                heapq.heappush(frontier, (h, neighbor, path + [neighbor]))
+                if astar:
+                    g = cost + (graph.get_weight(current, neighbor) if graph.weighted else 1)
+                    heapq.heappush(frontier, (g + epsilon * h, neighbor, path + [neighbor], g, h))
+                else:
+                    heapq.heappush(frontier, (h, neighbor, path + [neighbor], 0, h))
                 counters["pq.push"] += 1
 
-    return {
-        "path": None,
-        "time": (time.time() - start_time) * 1000,
+        if mode == "beam" and len(frontier) > beam_width:
+            counters["beam.pruned"] += len(frontier) - beam_width
+            frontier = heapq.nsmallest(beam_width, frontier) # a sorted list is a valid heap
+
+    elapsed = time.perf_counter_ns() - start_time
+    inst.add_counters({k: v for k, v in counters.items() if k != "best.h"}, "gbfs.")
+    inst.add_time("gbfs", elapsed)
+    result = {
+        "path": found,
+        "time": elapsed / 1e6,
         "metrics": counters
     }
+    if found is None:
+        result["partial_path"] = best_path
+    elif astar:
+        result["cost"] = cost
+    return result
 
-def bellman_ford(graph, start, goal):
+def bellman_ford(graph, start, goal, instrumentation=None):
     """
     Bellman-Ford algorithm.
 
@@ -67,6 +122,7 @@ def bellman_ford(graph, start, goal):
         graph: an instance of Graph.
         start: the starting vertex.
         goal: the goal vertex.
+        instrumentation: optional Instrumentation, receives the counters as "bellman_ford.*"
 
     Returns:
         A dictionary with keys:
@@ -78,7 +134,8 @@ def bellman_ford(graph, start, goal):
 
     Overall time complexity: O(V * E), where V is the number of vertices and E the number of edges.
     """
-    start_time = time.time()
+    inst = get_instrumentation(instrumentation)
+    start_time = time.perf_counter_ns()
 
     vertices = graph.get_vertices()
     dist = {v: float("inf") for v in vertices}
@@ -101,7 +158,9 @@ def bellman_ford(graph, start, goal):
                     updated = True
         if(i == V): break
         i+=1
-    end_time = time.time()
+    end_time = time.perf_counter_ns()
+    inst.add_counters(counters, "bellman_ford.")
+    inst.add_time("bellman_ford", end_time - start_time)
 
     # Reconstruct the path from start to goal.
     path = []
@@ -117,6 +176,6 @@ def bellman_ford(graph, start, goal):
     return {
         "cost": dist[goal],
         "path": path,
-        "time": (end_time - start_time) * 1000,
+        "time": (end_time - start_time) / 1e6,
         "metrics": counters
     }
\ No newline at end of file
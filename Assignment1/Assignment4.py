@@ -1,67 +1,51 @@
 from Lab01 import Graph
 from collections import defaultdict, deque
+from Connectivity import DisjointSet
+from Instrumentation import get_instrumentation
 
 
-def kruskal_mst(graph):
+def kruskal_mst(graph, instrumentation=None):
     '''
     Complexity O(ElogE) where e is the number of edges in the graph
+    Counters (when instrumented): mst.edges_considered, mst.edges_added
     '''
-    parent = {}
-    rank = {} #this refers to the rank of the tree so far. Basically if the rank of the node is 0 it means is the highest in the tree.
-
-    def find(v): #uses path compression
-        while parent[v] != v:
-            parent[v] = parent[parent[v]] # we find the root of the node v and mark all the vertices above to node to that root
-            v = parent[v]
-        return v
-
-    def union(u, v):
-        root_u = find(u)
-        root_v = find(v)
-        if root_u == root_v:
-            return False  # Already connected
-        if rank[root_u] < rank[root_v]:
-            parent[root_u] = root_v
-        else:
-            parent[root_v] = root_u
-            if rank[root_u] == rank[root_v]:
-                rank[root_u] += 1
-        return True
-
-    for v in graph.get_vertices():
-        parent[v] = v
-        rank[v] = 0
-
-    # Sort edges by weight
-    edges = []
-    for u in graph.out_adj_list:
-        for v in graph.out_adj_list[u]:
-            if graph.weighted:
-                w = graph.get_weight(u, v)
-            else:
-                w = 1
-            if (v, u) not in edges: #make sure to not take the same edge twice(undirected graphs)
-                edges.append((u, v, w))
-
-    edges.sort(key=lambda x: x[2])#soprting edges by weight
-
-    # Build MST
-    mst = Graph(directed=False, weighted=True)
-    for v in graph.get_vertices():
-        mst.add_vertex(v)
-
-    for u, v, w in edges:
-        if union(u, v):
-            mst.add_edge(u, v, w)
-
+    inst = get_instrumentation(instrumentation)
+    with inst.timer("kruskal_mst"):
+        sets = DisjointSet(graph.get_vertices()) # union-find with path halving and union by size
+
+        # Sort edges by weight
+        edges = []
+        for u in graph.out_adj_list:
+            for v in graph.out_adj_list[u]:
+                if graph.weighted:
+                    w = graph.get_weight(u, v)
+                else:
+                    w = 1
+                if (v, u) not in edges: #make sure to not take the same edge twice(undirected graphs)
+                    edges.append((u, v, w))
+
+        edges.sort(key=lambda x: x[2])#soprting edges by weight
+
+        # Build MST
+        mst = Graph(directed=False, weighted=True)
+        for v in graph.get_vertices():
+            mst.add_vertex(v)
+
+        for u, v, w in edges:
+            if sets.union(u, v):
+                mst.add_edge(u, v, w)
+
+    inst.count("mst.edges_considered", len(edges))
+    inst.count("mst.edges_added", mst.get_e())
     return mst
 
 
-def count_leaf_nodes(tree, root):
+def count_leaf_nodes(tree, root, instrumentation=None):
     '''
     This is basically a BFS of the tree and each time we reach a neighbor without any new neighbors, we count him as a leaf node.
     Complexity O(V+E)
     '''
+    inst = get_instrumentation(instrumentation)
     visited = set()
     queue = deque([root])
     visited.add(root)
@@ -69,7 +53,7 @@ def count_leaf_nodes(tree, root):
 
     while queue:
         node = queue.popleft()
-        neighbors = set(tree.out_neighbors(node)) | set(tree.in_neighbors(node))
+        neighbors = tree.all_neighbors(node)
         unvisited = [n for n in neighbors if n not in visited]
 
         if not unvisited:
@@ -79,12 +63,14 @@ def count_leaf_nodes(tree, root):
                 visited.add(n)
                 queue.append(n)
 
+    inst.count("mst.nodes_visited", len(visited))
+    inst.count("mst.leaves", leaf_count)
     return leaf_count
 
 
-def mst_leaf_count_kruskal(graph, root):
+def mst_leaf_count_kruskal(graph, root, instrumentation=None):
     if graph.directed:
         raise ValueError("Graph must be undirected for Kruskal's algorithm.")
 
-    mst = kruskal_mst(graph)
-    return count_leaf_nodes(mst, root)
+    mst = kruskal_mst(graph, instrumentation)
+    return count_leaf_nodes(mst, root, instrumentation)
@@ -1,13 +1,14 @@
 from Lab01 import Graph
-from copy import deepcopy
+from Connectivity import is_connected
+from Instrumentation import get_instrumentation
+from GraphViews import GraphView
 
 
 def is_complete(graph):
     vertices = graph.get_vertices()
     n = len(vertices)
     for u in vertices:
-        neighbors = set(graph.out_neighbors(u)) | set(graph.in_neighbors(u))
-        if len(neighbors) != n - 1:
+        if graph.degree(u) != n - 1:
             return False
     return True
 
@@ -17,6 +18,10 @@ def is_complete(graph):
     we use BFS to color the graph such that no two neighbors have the same color. This means the graph it bipartite
 '''
 def is_complete_bipartite(graph):
+    # A complete bipartite graph with at least one edge is connected, so a
+    # disconnected one can be rejected without coloring it.
+    if graph.get_e() and not is_connected(graph):
+        return False
     vertices = graph.get_vertices()
     visited = set()
     color = {}
@@ -26,7 +31,7 @@ def is_complete_bipartite(graph):
         color[start] = 0
         while queue:
             u = queue.pop(0)
-            for v in set(graph.out_neighbors(u)) | set(graph.in_neighbors(u)):
+            for v in graph.all_neighbors(u):
                 if v not in color:
                     color[v] = 1 - color[u]
                     queue.append(v)
@@ -60,27 +65,38 @@ def is_complete_bipartite(graph):
     return True
 
 
-def reduce_graph(graph):
-    g = deepcopy(graph) # I used the deep copy to make a copy of the original graph so I don't modify the graph directly
+def reduce_graph(graph, instrumentation=None):
+    inst = get_instrumentation(instrumentation)
+    if isinstance(graph, GraphView):
+        g = graph.to_graph() # views are read-only, so reduce a materialized copy
+    else:
+        g = graph.copy() # I used a copy of the original graph so I don't modify the graph directly
     changed = True
+    passes = 0
+    reductions = 0
 
     while changed: #very simple implementation I used changed to redo the for loop everytime I make a change in the graph
         changed = False
+        passes += 1
         for vertex in list(g.get_vertices()):
-            neighbors = list(set(g.out_neighbors(vertex)) | set(g.in_neighbors(vertex)))
-            if len(neighbors) == 2:
-                u, v = neighbors
+            if g.degree(vertex) == 2:
+                u, v = g.all_neighbors(vertex)
                 if not g.is_edge(u, v) and not g.is_edge(v, u):
                     g.remove_vertex(vertex)
                     g.add_edge(u, v)
+                    reductions += 1
                     changed = True
                     break
+    inst.count("homeomorphism.passes", passes)
+    inst.count("homeomorphism.reductions", reductions)
     return g
 
 
-def is_homeomorphic_to_complete_or_bipartite(graph):
+def is_homeomorphic_to_complete_or_bipartite(graph, instrumentation=None):
     if graph.directed:
         raise ValueError("This function works only on undirected graphs.")
 
-    reduced = reduce_graph(graph)
-    return is_complete(reduced) or is_complete_bipartite(reduced)
+    inst = get_instrumentation(instrumentation)
+    with inst.timer("homeomorphism"):
+        reduced = reduce_graph(graph, instrumentation)
+        return is_complete(reduced) or is_complete_bipartite(reduced)
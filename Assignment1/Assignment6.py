@@ -4,22 +4,35 @@ Given an undirected graph, find a Hamiltonian cycle using backtracking
 """
 
 from Lab01 import *
+from Connectivity import is_connected
+from Instrumentation import get_instrumentation
 
 
-def Hamiltonian(graph):
+def find_hamiltonian_cycle(graph, instrumentation=None):
+    """
+    Return a Hamiltonian cycle as a list of vertices (first vertex repeated at
+    the end), or None if there is none.
+    """
+    inst = get_instrumentation(instrumentation)
     vertices = graph.get_vertices()
     n = len(vertices)
+    if n == 0:
+        return None
+    if n > 1 and not is_connected(graph):
+        return None # no cycle can visit every vertex of a disconnected graph
     path = [vertices[0]]
     visited = set([vertices[0]])
+    counters = {"calls": 0, "backtracks": 0}
 
     def backtracking(current_vertex):
+        counters["calls"] += 1
         if len(path) == n:
-            if vertices[0] in graph.out_neighbors(current_vertex):
+            if vertices[0] in graph.out_neighbors_view(current_vertex):
                 path.append(vertices[0])
                 return True
             return False
 
-        for neighbor in graph.out_neighbors(current_vertex):
+        for neighbor in graph.out_neighbors_view(current_vertex):
             if neighbor not in visited:
                 path.append(neighbor)
                 visited.add(neighbor)
@@ -27,10 +40,20 @@ def Hamiltonian(graph):
                     return True
                 visited.remove(neighbor)
                 path.pop()
+                counters["backtracks"] += 1
         return False
 
-    if backtracking(vertices[0]):
+    with inst.timer("hamiltonian"):
+        found = backtracking(vertices[0])
+    inst.add_counters(counters, "hamiltonian.")
+    return path if found else None
+
+
+def Hamiltonian(graph, instrumentation=None):
+    cycle = find_hamiltonian_cycle(graph, instrumentation)
+    if cycle is not None:
         print("Hamiltonian Cycle found:")
-        print(" -> ".join(path))
+        print(" -> ".join(cycle))
     else:
-        print("Hamiltonian Cycle NOT found")
\ No newline at end of file
+        print("Hamiltonian Cycle NOT found")
+    return cycle
\ No newline at end of file
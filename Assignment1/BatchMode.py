@@ -0,0 +1,251 @@
+"""
+Non-interactive batch mode for main.py.
+
+Reads one command per line from a script file or stdin, runs it against a
+single in-memory Graph and writes the results as they are produced.
+Blank lines and lines starting with '#' are ignored. Mutations print nothing
+on success; every failing command prints "error <line>: <message>" and the
+batch continues.
+
+Commands:
+    new directed|undirected weighted|unweighted
+    load FILE                   positions FILE
+    add_vertex V                remove_vertex V
+    add_edge U V [W]            remove_edge U V
+    set_weight U V W            get_weight U V
+    is_edge U V                 neighbors V
+    vertices                    counts
+    directed yes|no             weighted yes|no
+    bfs V                       dfs V
+    path START GOAL             gbfs START GOAL
+    mst [ROOT]                  hamiltonian
+    homeomorphic                print
+    save FILE
+
+gbfs also takes KEY=VALUE options: mode=greedy|weighted_astar|beam,
+epsilon=E, width=W, max_expansions=N, time_limit=MS (see
+greedy_best_first_search). A search stopped by its budget prints
+"budget exhausted after N expansions: <partial path>".
+"""
+
+import inspect
+import sys
+import time
+
+from Lab01 import Graph
+from AlgorithmRegistry import get as algorithm
+from PositionsLoader import load_positions
+
+
+def parse_number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_flag(text, yes, no):
+    text = text.lower()
+    if text in (yes, "yes", "true", "1"):
+        return True
+    if text in (no, "no", "false", "0"):
+        return False
+    raise ValueError(f"Expected '{yes}' or '{no}'.")
+
+
+SEARCH_OPTIONS = {
+    "mode": ("mode", str),
+    "epsilon": ("epsilon", float),
+    "width": ("beam_width", int),
+    "max_expansions": ("max_expansions", int),
+    "time_limit": ("time_limit_ms", float),
+}
+
+
+def parse_search_options(options):
+    """
+    Turn KEY=VALUE words into keyword arguments for greedy_best_first_search.
+    """
+    kwargs = {}
+    for option in options:
+        key, sep, value = option.partition("=")
+        if not sep or key not in SEARCH_OPTIONS:
+            raise ValueError(f"Unknown search option '{option}'.")
+        name, convert = SEARCH_OPTIONS[key]
+        try:
+            kwargs[name] = convert(value)
+        except ValueError:
+            raise ValueError(f"Invalid value for '{key}': {value}")
+    return kwargs
+
+
+class BatchSession:
+    """
+    Holds the graph (and positions) shared by all the commands of a batch.
+    """
+
+    def __init__(self, graph=None, out=sys.stdout, timed=False):
+        self.graph = graph if graph is not None else Graph(directed=True, weighted=False)
+        self.positions = {}
+        self.out = out
+        self.timed = timed
+        self._written = False
+
+    def write(self, text):
+        self.out.write(text + "\n")
+        self._written = True
+
+    # --- graph building -------------------------------------------------
+
+    def cmd_new(self, kind, weighting):
+        self.graph = Graph(directed=parse_flag(kind, "directed", "undirected"),
+                           weighted=parse_flag(weighting, "weighted", "unweighted"))
+
+    def cmd_load(self, filename):
+        self.graph = Graph.create_from_file(filename)
+        self.write(f"loaded {self.graph.get_v()} vertices {self.graph.get_e()} edges")
+
+    def cmd_positions(self, filename):
+        self.positions = load_positions(filename)
+        self.write(f"loaded {len(self.positions)} positions")
+
+    def cmd_add_vertex(self, v):
+        self.graph.add_vertex(v)
+
+    def cmd_remove_vertex(self, v):
+        self.graph.remove_vertex(v)
+
+    def cmd_add_edge(self, u, v, weight="0"):
+        self.graph.add_edge(u, v, parse_number(weight))
+
+    def cmd_remove_edge(self, u, v):
+        self.graph.remove_edge(u, v)
+
+    def cmd_set_weight(self, u, v, weight):
+        self.graph.set_weight(u, v, parse_number(weight))
+
+    def cmd_directed(self, flag):
+        self.graph.change_directed(parse_flag(flag, "directed", "undirected"))
+
+    def cmd_weighted(self, flag):
+        self.graph.change_weighted(parse_flag(flag, "weighted", "unweighted"))
+
+    # --- queries ----------------------------------------------------------
+
+    def cmd_get_weight(self, u, v):
+        self.write(str(self.graph.get_weight(u, v)))
+
+    def cmd_is_edge(self, u, v):
+        self.write(str(self.graph.is_edge(u, v)))
+
+    def cmd_neighbors(self, v):
+        self.write(" ".join(str(n) for n in self.graph.out_neighbors_view(v)))
+
+    def cmd_vertices(self):
+        self.write(" ".join(str(v) for v in self.graph.get_vertices()))
+
+    def cmd_counts(self):
+        self.write(f"{self.graph.get_v()} {self.graph.get_e()}")
+
+    def cmd_print(self):
+        self.graph.write_to_file(self.out)
+        self._written = True
+
+    def cmd_save(self, filename):
+        self.graph.write_to_file(filename)
+
+    def cmd_bfs(self, start):
+        self.write(" ".join(f"{v}:{d}" for v, d in algorithm("bfs")(self.graph, start)))
+
+    def cmd_dfs(self, start):
+        self.write(" ".join(f"{v}:{d}" for v, d in algorithm("dfs")(self.graph, start)))
+
+    def cmd_path(self, start, goal):
+        if start not in self.graph.out_adj_list or goal not in self.graph.out_adj_list:
+            raise ValueError("One or both vertices do not exist.")
+        result = algorithm("bellman_ford")(self.graph, start, goal)
+        if result["path"] is None:
+            self.write("no path")
+        else:
+            self.write(f"{result['cost']} {' '.join(result['path'])}")
+
+    def cmd_gbfs(self, start, goal, *options):
+        if start not in self.graph.out_adj_list or goal not in self.graph.out_adj_list:
+            raise ValueError("One or both vertices do not exist.")
+        if start not in self.positions or goal not in self.positions:
+            raise ValueError("Position data missing or incomplete (use 'positions FILE').")
+        kwargs = parse_search_options(options)
+        result = algorithm("gbfs")(self.graph, start, goal, self.positions, **kwargs)
+        if result["path"]:
+            self.write(" ".join(result["path"]))
+        elif result["metrics"]["budget.exhausted"]:
+            self.write(f"budget exhausted after {result['metrics']['expansions']} expansions: "
+                       + " ".join(result["partial_path"]))
+        else:
+            self.write("no path")
+
+    def cmd_mst(self, root=None):
+        if self.graph.directed:
+            raise ValueError("Graph must be undirected for Kruskal's algorithm.")
+        mst = algorithm("mst")(self.graph)
+        total = sum(mst.weights.values())
+        line = f"{mst.get_e()} edges weight {total}"
+        if root is not None:
+            if root not in mst.out_adj_list:
+                raise ValueError("Vertex does not exist.")
+            line += f" leaves {algorithm('count_leaves')(mst, root)}"
+        self.write(line)
+
+    def cmd_hamiltonian(self):
+        cycle = algorithm("hamiltonian")(self.graph)
+        self.write(" ".join(cycle) if cycle else "none")
+
+    def cmd_homeomorphic(self):
+        self.write(str(algorithm("homeomorphism")(self.graph)))
+
+    # --- driver -------------------------------------------------------------
+
+    def execute(self, line, line_number=0):
+        """
+        Run one command line. Returns False if the line was a failing command.
+        """
+        parts = line.split()
+        if not parts or parts[0].startswith("#"):
+            return True
+        handler = getattr(self, "cmd_" + parts[0].lower(), None)
+        start = time.perf_counter_ns()
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown command '{parts[0]}'.")
+            try:
+                inspect.signature(handler).bind(*parts[1:])
+            except TypeError:
+                raise ValueError(f"Wrong number of arguments for '{parts[0]}'.")
+            handler(*parts[1:])
+            ok = True
+        except (ValueError, OSError) as e:
+            self.write(f"error {line_number}: {e}")
+            ok = False
+        except KeyError as e:
+            # e.g. a vertex reached by GBFS that has no position
+            self.write(f"error {line_number}: missing data for {e}")
+            ok = False
+        if self.timed:
+            self.write(f"# {parts[0]} {(time.perf_counter_ns() - start) / 1e6:.3f}ms")
+        if self._written:
+            # Stream results to whoever reads our output as soon as they exist.
+            self.out.flush()
+            self._written = False
+        return ok
+
+    def run(self, lines):
+        """
+        Run every command of an iterable of lines (e.g. an open file).
+        Returns the number of failing commands.
+        """
+        errors = 0
+        for number, line in enumerate(lines, 1):
+            if not self.execute(line, number):
+                errors += 1
+        self.out.flush()
+        return errors
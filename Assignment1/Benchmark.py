@@ -0,0 +1,327 @@
+"""
+Benchmark suite for the graph algorithms.
+
+Runs every workload on seeded synthetic graphs (see GraphGenerators) at
+several scales, repeats each measurement, and reports median / p95 times.
+Results can be written as JSON and compared against a saved baseline.
+
+Usage:
+    python Benchmark.py --edges 1000 10000 --trials 5 --output bench.json
+    python Benchmark.py --baseline bench.json --threshold 0.2
+    python Benchmark.py --startup --trials 20     start-up time of main.py
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from Lab01 import Graph, BFSIterator, DFSIterator
+from Assignment3 import bellman_ford, greedy_best_first_search
+from Assignment4 import kruskal_mst
+from Assignment5 import is_homeomorphic_to_complete_or_bipartite
+from Assignment6 import Hamiltonian
+import GraphGenerators
+
+DEFAULT_SCALES = (1000, 10000, 100000, 1000000)
+
+# Hamiltonian is exponential, so it runs on the subgraph induced by the
+# first few vertices instead of the whole graph.
+HAMILTONIAN_VERTICES = 12
+
+# Bellman-Ford is O(V * E) and kruskal_mst currently de-duplicates edges with
+# a list scan (O(E^2)), so they are only measured up to this size.
+# reduce_graph restarts its scan after every reduction, so homeomorphism has
+# an even lower limit (see WORKLOADS).
+QUADRATIC_MAX_EDGES = 20000
+
+
+def _induced_subgraph(graph, vertices):
+    sub = Graph(directed=graph.directed, weighted=graph.weighted)
+    keep = set(vertices)
+    for v in vertices:
+        sub.add_vertex(v)
+    for u in vertices:
+        for v in graph.out_adj_list[u]:
+            if v in keep and not sub.is_edge(u, v):
+                sub.add_edge(u, v, graph.get_weight(u, v) if graph.weighted else 0)
+    return sub
+
+
+class Workload:
+    """
+    One benchmarked operation.
+
+    setup(graph, positions, rng) prepares the arguments once per graph,
+    run(*args) is what gets timed. Graphs with more than max_edges edges are
+    skipped (the algorithm is too slow for them to be worth measuring).
+    """
+
+    def __init__(self, name, setup, run, max_edges=None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.max_edges = max_edges
+
+
+def _setup_load(graph, positions, rng):
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w") as f:
+        graph.write_to_file(f)
+    return (path,)
+
+
+def _run_load(path):
+    Graph.create_from_file(path)
+
+
+def _setup_start(graph, positions, rng):
+    vertices = graph.get_vertices()
+    return (graph, vertices[rng.randrange(len(vertices))])
+
+
+def _setup_pair(graph, positions, rng):
+    vertices = graph.get_vertices()
+    return (graph, vertices[rng.randrange(len(vertices))], vertices[rng.randrange(len(vertices))], positions)
+
+
+def _run_bfs(graph, start):
+    for _ in BFSIterator(graph, start):
+        pass
+
+
+def _run_dfs(graph, start):
+    for _ in DFSIterator(graph, start):
+        pass
+
+
+def _run_gbfs(graph, start, goal, positions):
+    greedy_best_first_search(graph, start, goal, positions)
+
+
+def _run_bellman_ford(graph, start, goal, positions):
+    bellman_ford(graph, start, goal)
+
+
+def _setup_graph(graph, positions, rng):
+    return (graph,)
+
+
+def _setup_hamiltonian(graph, positions, rng):
+    # The first vertices reached by BFS form a connected piece of the graph;
+    # the first ids usually give a disconnected graph or a path.
+    vertices = graph.get_vertices()
+    start = vertices[rng.randrange(len(vertices))]
+    reached = [v for v, _ in itertools.islice(BFSIterator(graph, start), HAMILTONIAN_VERTICES)]
+    return (_induced_subgraph(graph, reached),)
+
+
+def _run_hamiltonian(graph):
+    with contextlib.redirect_stdout(io.StringIO()):
+        Hamiltonian(graph)
+
+
+WORKLOADS = [
+    Workload("load", _setup_load, _run_load),
+    Workload("bfs", _setup_start, _run_bfs),
+    Workload("dfs", _setup_start, _run_dfs),
+    Workload("gbfs", _setup_pair, _run_gbfs),
+    Workload("bellman_ford", _setup_pair, _run_bellman_ford, max_edges=QUADRATIC_MAX_EDGES),
+    Workload("mst", _setup_graph, kruskal_mst, max_edges=QUADRATIC_MAX_EDGES),
+    Workload("homeomorphism", _setup_graph, is_homeomorphic_to_complete_or_bipartite, max_edges=5000),
+    Workload("hamiltonian", _setup_hamiltonian, _run_hamiltonian),
+]
+
+
+def percentile(samples, p):
+    """
+    Nearest-rank percentile of a list of numbers (p in [0, 100]).
+    """
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples_ns):
+    """
+    Summary statistics (in milliseconds) of a list of durations in nanoseconds.
+    """
+    samples = [s / 1e6 for s in samples_ns]
+    return {
+        "trials": len(samples),
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "p95_ms": percentile(samples, 95),
+        "mean_ms": statistics.fmean(samples),
+    }
+
+
+def time_trials(func, args, trials, warmup=1):
+    """
+    Call func(*args) `warmup` times untimed, then `trials` times timed.
+    Returns the list of durations in nanoseconds.
+    """
+    for _ in range(warmup):
+        func(*args)
+    samples = []
+    for _ in range(trials):
+        start = time.perf_counter_ns()
+        func(*args)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def run_benchmarks(kinds=GraphGenerators.GENERATORS, scales=DEFAULT_SCALES, workloads=None,
+                   trials=5, warmup=1, seed=0, log=None):
+    """
+    Run the benchmark matrix and return a list of result dicts:
+    {"graph", "edges", "vertices", "workload", "status", ...summary}
+    """
+    selected = [w for w in WORKLOADS if workloads is None or w.name in workloads]
+    results = []
+    for kind in kinds:
+        for scale in scales:
+            graph, positions = GraphGenerators.generate(kind, scale, seed)
+            for workload in selected:
+                entry = {
+                    "graph": kind,
+                    "scale": scale,
+                    "edges": graph.get_e(),
+                    "vertices": graph.get_v(),
+                    "workload": workload.name,
+                }
+                if workload.max_edges is not None and graph.get_e() > workload.max_edges:
+                    entry["status"] = "skipped"
+                else:
+                    rng = random.Random(seed)
+                    args = workload.setup(graph, positions, rng)
+                    try:
+                        entry.update(summarize(time_trials(workload.run, args, trials, warmup)))
+                        entry["status"] = "ok"
+                    finally:
+                        if workload.name == "load":
+                            os.remove(args[0])
+                results.append(entry)
+                if log is not None:
+                    log(format_result(entry))
+    return results
+
+
+# Start-up scenarios: Python code run in a fresh interpreter next to main.py.
+# "eager" imports every registered algorithm, like main.py used to.
+STARTUP_SCENARIOS = (
+    ("interpreter", "pass"),
+    ("main", "import main"),
+    ("main_eager", "import main, AlgorithmRegistry; AlgorithmRegistry.load_all()"),
+)
+
+
+def _run_python(code):
+    subprocess.run([sys.executable, "-c", code], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_startup_benchmarks(trials=5, warmup=1, log=None):
+    """
+    Time a fresh interpreter for every STARTUP_SCENARIOS entry. The results
+    have the same format as run_benchmarks (graph "startup", scale 0), so
+    they can be saved and compared against a baseline the same way.
+    """
+    results = []
+    for name, code in STARTUP_SCENARIOS:
+        entry = {"graph": "startup", "scale": 0, "edges": 0, "vertices": 0, "workload": name}
+        entry.update(summarize(time_trials(_run_python, (code,), trials, warmup)))
+        entry["status"] = "ok"
+        results.append(entry)
+        if log is not None:
+            log(format_result(entry))
+    return results
+
+
+def result_key(entry):
+    return f"{entry['graph']}/{entry['scale']}/{entry['workload']}"
+
+
+def compare_to_baseline(results, baseline, threshold=0.2):
+    """
+    Compare results with a baseline (same format). Returns the list of
+    regressions: entries whose median is more than `threshold` (fraction)
+    slower than the baseline median.
+    """
+    previous = {result_key(e): e for e in baseline if e.get("status") == "ok"}
+    regressions = []
+    for entry in results:
+        old = previous.get(result_key(entry))
+        if entry.get("status") != "ok" or old is None:
+            continue
+        if entry["median_ms"] > old["median_ms"] * (1 + threshold):
+            regressions.append({
+                "key": result_key(entry),
+                "baseline_median_ms": old["median_ms"],
+                "median_ms": entry["median_ms"],
+                "ratio": entry["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf"),
+            })
+    return regressions
+
+
+def format_result(entry):
+    if entry["status"] != "ok":
+        return f"{entry['graph']:<12} {entry['edges']:>9} {entry['workload']:<14} {entry['status']}"
+    return (f"{entry['graph']:<12} {entry['edges']:>9} {entry['workload']:<14} "
+            f"median {entry['median_ms']:>11.3f}ms  p95 {entry['p95_ms']:>11.3f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the graph algorithms on synthetic graphs.")
+    parser.add_argument("--graphs", nargs="+", default=list(GraphGenerators.GENERATORS),
+                        choices=GraphGenerators.GENERATORS)
+    parser.add_argument("--edges", nargs="+", type=int, default=list(DEFAULT_SCALES))
+    parser.add_argument("--workloads", nargs="+", choices=[w.name for w in WORKLOADS])
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown of the median counted as a regression")
+    parser.add_argument("--startup", action="store_true",
+                        help="measure the start-up time of main.py instead of the algorithms")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        results = run_startup_benchmarks(args.trials, args.warmup, log=print)
+    else:
+        results = run_benchmarks(args.graphs, args.edges, args.workloads, args.trials, args.warmup,
+                                 args.seed, log=print)
+    report = {"python": sys.version.split()[0], "results": results}
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline["results"], args.threshold)
+        report["regressions"] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['key']}: {r['baseline_median_ms']:.3f}ms -> {r['median_ms']:.3f}ms "
+                  f"(x{r['ratio']:.2f})")
+        if regressions:
+            exit_code = 1
+        else:
+            print("No regressions.")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
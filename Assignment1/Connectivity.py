@@ -0,0 +1,235 @@
+"""
+Disjoint sets and connected components.
+
+DisjointSet is a union-find over arbitrary hashable items: every item gets an
+index when it is added and the forest is kept in two flat arrays (parent and
+component size), with path halving in find and union by size.
+
+ConnectivityIndex keeps the connected components of a Graph (weakly
+connected components for directed graphs, i.e. edge directions are ignored)
+so that same-component and component-size queries are near O(1). It follows
+the graph through Graph.subscribe: added vertices and edges are merged in
+directly, while removals (which a union-find cannot undo) only mark the index
+stale, and it is rebuilt on the next query. Use Graph.connectivity() to get
+the graph's shared index; is_connected() only uses it if it already exists.
+
+    index = g.connectivity()
+    index.connected("A", "E"), index.component_size("A"), index.is_connected()
+"""
+
+import array
+
+
+class DisjointSet:
+    def __init__(self, items=()):
+        """
+        Time complexity: O(n) for n initial items
+        """
+        self.index = {}
+        self.items = []
+        self.parent = array.array("q")
+        self.size = array.array("q")
+        self.count = 0  # number of components
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def add(self, item):
+        """
+        Add item as a new singleton component (no-op if it is already there).
+        Returns its index.
+
+        Time complexity: O(1) amortized
+        """
+        i = self.index.get(item)
+        if i is None:
+            i = len(self.items)
+            self.index[item] = i
+            self.items.append(item)
+            self.parent.append(i)
+            self.size.append(1)
+            self.count += 1
+        return i
+
+    def _find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]  # path halving
+            i = parent[i]
+        return i
+
+    def _index_of(self, item):
+        i = self.index.get(item)
+        if i is None:
+            raise ValueError("Item does not exist.")
+        return i
+
+    def find(self, item):
+        """
+        Representative item of the component of item.
+
+        Time complexity: O(a(n)) amortized
+        """
+        return self.items[self._find(self._index_of(item))]
+
+    def union(self, a, b):
+        """
+        Merge the components of a and b. Returns False if they were already
+        in the same component.
+
+        Time complexity: O(a(n)) amortized
+        """
+        return self._union(self._index_of(a), self._index_of(b))
+
+    def _union(self, i, j):
+        i = self._find(i)
+        j = self._find(j)
+        if i == j:
+            return False
+        size = self.size
+        if size[i] < size[j]:
+            i, j = j, i
+        self.parent[j] = i
+        size[i] += size[j]
+        self.count -= 1
+        return True
+
+    def connected(self, a, b):
+        """
+        Time complexity: O(a(n)) amortized
+        """
+        return self._find(self._index_of(a)) == self._find(self._index_of(b))
+
+    def component_size(self, item):
+        """
+        Time complexity: O(a(n)) amortized
+        """
+        return self.size[self._find(self._index_of(item))]
+
+    def components(self):
+        """
+        List of components, each a list of items.
+
+        Time complexity: O(n a(n))
+        """
+        groups = {}
+        for i, item in enumerate(self.items):
+            groups.setdefault(self._find(i), []).append(item)
+        return list(groups.values())
+
+
+class ConnectivityIndex:
+    def __init__(self, graph):
+        self.graph = graph
+        self.metrics = {"rebuilds": 0}
+        self._stale = True
+        graph.subscribe(self._on_change)
+
+    def close(self):
+        """
+        Stop following the graph.
+        """
+        self.graph.unsubscribe(self._on_change)
+
+    def rebuild(self):
+        """
+        Time complexity: O(V + E a(V))
+        """
+        sets = DisjointSet(self.graph.out_adj_list)
+        index = sets.index
+        for u, neighbors in self.graph.out_adj_list.items():
+            i = index[u]
+            for v in neighbors:
+                sets._union(i, index[v])
+        self.sets = sets
+        self._stale = False
+        self.metrics["rebuilds"] += 1
+
+    def _current(self):
+        if self._stale:
+            self.rebuild()
+        return self.sets
+
+    def _on_change(self, event, *args):
+        if self._stale:
+            return
+        if event == "add_vertex":
+            self.sets.add(args[0])
+        elif event == "add_vertices":
+            for v in args[0]:
+                self.sets.add(v)
+        elif event == "add_edge":
+            self.sets.union(args[0], args[1])
+        elif event == "add_edges":
+            for u, v, _ in args[0]:
+                self.sets.union(u, v)
+        elif event != "set_weight":
+            # Removals split components, which a union-find cannot do.
+            self._stale = True
+
+    # --- queries --------------------------------------------------------------
+
+    def connected(self, u, v):
+        """
+        True if u and v are in the same (weakly) connected component.
+
+        Time complexity: O(a(V)) amortized, O(V + E) after a removal
+        """
+        sets = self._current()
+        if u not in sets or v not in sets:
+            raise ValueError("One or both vertices do not exist.")
+        return sets.connected(u, v)
+
+    def component_size(self, vertex):
+        """
+        Number of vertices in the component of vertex.
+
+        Time complexity: O(a(V)) amortized, O(V + E) after a removal
+        """
+        sets = self._current()
+        if vertex not in sets:
+            raise ValueError("Vertex does not exist.")
+        return sets.component_size(vertex)
+
+    def component_count(self):
+        """
+        Time complexity: O(1), O(V + E) after a removal
+        """
+        return self._current().count
+
+    def is_connected(self):
+        """
+        True if the graph has at most one component (the empty graph is
+        connected).
+        """
+        return self.component_count() <= 1
+
+    def components(self):
+        """
+        Time complexity: O(V a(V))
+        """
+        return self._current().components()
+
+
+def is_connected(graph):
+    """
+    True if the graph (ignoring edge directions) has at most one component.
+    Uses the graph's connectivity index if one is already attached (see
+    Graph.connectivity); otherwise builds a throwaway DisjointSet over its
+    edges, so a one-off query does not subscribe anything to the graph.
+
+    Time complexity: O(1) with an up-to-date index, O(V + E a(V)) otherwise
+    """
+    index = getattr(graph, "_connectivity", None)
+    if index is not None:
+        return index.is_connected()
+    sets = DisjointSet(graph.out_adj_list)
+    for u in graph.out_adj_list:
+        for v in graph.out_adj_list[u]:
+            sets.union(u, v)
+    return sets.count <= 1
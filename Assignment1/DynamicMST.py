@@ -0,0 +1,251 @@
+"""
+Minimum spanning tree (forest) kept up to date while the graph changes.
+
+MaintainedMST subscribes to an undirected Graph and updates its tree after
+every edit instead of rerunning kruskal_mst:
+
+  - add_edge / lower set_weight of a non-tree edge (u, v, w): if u and v are
+    in different trees the edge joins them, otherwise the heaviest edge on
+    the tree path u..v is swapped out when it is heavier than w
+    (cycle property);
+  - remove_edge / higher set_weight of a tree edge / remove_vertex: the tree
+    edges are cut and each piece is reconnected with the lightest graph edge
+    leaving it (cut property), searching from the smaller side of the cut;
+  - lower set_weight of a tree edge and higher set_weight / removal of a
+    non-tree edge change nothing.
+
+The tree is a Graph (undirected, weighted) like the one kruskal_mst returns,
+and the number of leaves is kept current.
+"""
+
+import collections
+
+from Assignment4 import kruskal_mst, count_leaf_nodes
+
+
+class MaintainedMST:
+    def __init__(self, graph):
+        if graph.directed:
+            raise ValueError("Graph must be undirected for Kruskal's algorithm.")
+        self.graph = graph
+        self.metrics = {"full_recomputes": 0, "swaps": 0, "replacements": 0}
+        self.recompute()
+        graph.subscribe(self._on_change)
+
+    def close(self):
+        """
+        Stop following the graph.
+        """
+        if self.graph is not None:
+            self.graph.unsubscribe(self._on_change)
+            self.graph = None
+
+    # --- queries --------------------------------------------------------------
+
+    def total_weight(self):
+        return sum(self.tree.weights.values())
+
+    def leaf_count(self, root):
+        """
+        Number of leaves of the tree containing root, counted like
+        count_leaf_nodes (root is a leaf only if it has no tree edges).
+
+        Time complexity: O(1) when the forest is a single spanning tree,
+        O(V) otherwise.
+        """
+        if root not in self.tree.out_adj_list:
+            raise ValueError("Vertex does not exist.")
+        if self.tree.get_e() != self.tree.get_v() - 1:
+            return count_leaf_nodes(self.tree, root)
+        leaves = len(self.leaves) - (1 if root in self.leaves else 0)
+        if not self.tree.out_adj_list[root]:
+            leaves += 1
+        return leaves
+
+    # --- helpers ----------------------------------------------------------------
+
+    def _weight(self, u, v):
+        return self.graph.get_weight(u, v) if self.graph.weighted else 1
+
+    def _update_leaf(self, v):
+        if len(self.tree.out_adj_list[v]) == 1:
+            self.leaves.add(v)
+        else:
+            self.leaves.discard(v)
+
+    def _tree_add(self, u, v, w):
+        self.tree.add_edge(u, v, w)
+        self._update_leaf(u)
+        self._update_leaf(v)
+
+    def _tree_remove(self, u, v):
+        self.tree.remove_edge(u, v)
+        self._update_leaf(u)
+        self._update_leaf(v)
+
+    def recompute(self):
+        """
+        Rebuild the tree with kruskal_mst.
+
+        Time complexity: same as kruskal_mst
+        """
+        if self.graph.directed:
+            raise ValueError("Graph must be undirected for Kruskal's algorithm.")
+        self.tree = kruskal_mst(self.graph)
+        self.leaves = {v for v, n in self.tree.out_adj_list.items() if len(n) == 1}
+        self.metrics["full_recomputes"] += 1
+
+    def _tree_path(self, u, v):
+        """
+        List of tree edges (a, b) on the path u..v, or None if u and v are in
+        different trees.
+
+        Time complexity: O(size of u's tree)
+        """
+        parent = {u: None}
+        queue = collections.deque([u])
+        tree_adj = self.tree.out_adj_list
+        while queue:
+            x = queue.popleft()
+            if x == v:
+                break
+            for y in tree_adj[x]:
+                if y not in parent:
+                    parent[y] = x
+                    queue.append(y)
+        if v not in parent:
+            return None
+        edges = []
+        while parent[v] is not None:
+            edges.append((parent[v], v))
+            v = parent[v]
+        return edges
+
+    def _insert(self, u, v, w):
+        """
+        Cycle property: edge (u, v, w) enters the tree if it connects two
+        trees or is lighter than the heaviest edge on the tree path u..v.
+        """
+        if u == v:
+            return
+        path = self._tree_path(u, v)
+        if path is None:
+            self._tree_add(u, v, w)
+            return
+        a, b = max(path, key=lambda e: self.tree.get_weight(*e))
+        if self.tree.get_weight(a, b) > w:
+            self._tree_remove(a, b)
+            self._tree_add(u, v, w)
+            self.metrics["swaps"] += 1
+
+    def _smaller_side(self, a, b):
+        """
+        Vertices of the smaller of the trees containing a and b, explored in
+        lockstep so the cost is proportional to the smaller one.
+        """
+        tree_adj = self.tree.out_adj_list
+        seen = ({a}, {b})
+        queues = (collections.deque([a]), collections.deque([b]))
+        while True:
+            for side in (0, 1):
+                if not queues[side]:
+                    return seen[side]
+                x = queues[side].popleft()
+                for y in tree_adj[x]:
+                    if y not in seen[side]:
+                        seen[side].add(y)
+                        queues[side].append(y)
+
+    def _add_lightest_leaving(self, side):
+        """
+        Add the lightest graph edge leaving the vertex set `side` to the tree
+        (cut property). Returns False if no edge leaves it.
+        """
+        best = None
+        graph_adj = self.graph.out_adj_list
+        for x in side:
+            for y in graph_adj[x]:
+                if y not in side:
+                    w = self._weight(x, y)
+                    if best is None or w < best[2]:
+                        best = (x, y, w)
+        if best is None:
+            return False
+        self._tree_add(*best)
+        self.metrics["replacements"] += 1
+        return True
+
+    def _reconnect(self, a, b):
+        """
+        a and b were joined by a tree edge that is gone: add the lightest graph
+        edge leaving the smaller of their trees, if any.
+        """
+        side = self._smaller_side(a, b)
+        if a in side and b in side:  # still connected (or a == b)
+            return
+        self._add_lightest_leaving(side)
+
+    def _cut(self, u, v):
+        if u in self.tree.out_adj_list and v in self.tree.out_adj_list[u]:
+            self._tree_remove(u, v)
+            self._reconnect(u, v)
+
+    # --- graph events -------------------------------------------------------------
+
+    def _on_change(self, event, *args):
+        if event == "reset":
+            if self.graph.directed:
+                # No spanning tree for directed graphs: stop following it.
+                self.close()
+            else:
+                self.recompute()
+        elif event == "add_vertex":
+            self.tree.add_vertex(args[0])
+        elif event == "add_vertices":
+            self.tree.add_vertices_from(args[0])
+        elif event == "add_edge":
+            u, v = args[0], args[1]
+            self._insert(u, v, self._weight(u, v))
+        elif event == "add_edges":
+            for u, v, _ in args[0]:
+                self._insert(u, v, self._weight(u, v))
+        elif event == "set_weight":
+            u, v, w = args
+            if v in self.tree.out_adj_list[u]:
+                if w <= self.tree.get_weight(u, v):
+                    self.tree.set_weight(u, v, w)
+                else:
+                    self._tree_remove(u, v)
+                    self._reconnect(u, v)
+            else:
+                self._insert(u, v, w)
+        elif event == "remove_edge":
+            self._cut(args[0], args[1])
+        elif event == "remove_edges":
+            for u, v in args[0]:
+                self._cut(u, v)
+        elif event == "remove_vertex":
+            vertex = args[0]
+            orphans = list(self.tree.out_adj_list[vertex])
+            self.tree.remove_vertex(vertex)
+            self.leaves.discard(vertex)
+            for x in orphans:
+                self._update_leaf(x)
+            # Every tree edge of the vertex was cut: join the pieces to the
+            # piece of an anchor orphan. An added edge may lead to a third
+            # piece, so repeat until x is connected to the anchor. A piece
+            # with no edges leaving it stays a separate tree; if it is the
+            # anchor's, x becomes the new anchor.
+            anchor = None
+            for x in orphans:
+                if anchor is None:
+                    anchor = x
+                    continue
+                while True:
+                    side = self._smaller_side(x, anchor)
+                    if x in side and anchor in side:
+                        break
+                    if not self._add_lightest_leaving(side):
+                        if anchor in side:
+                            anchor = x
+                        break
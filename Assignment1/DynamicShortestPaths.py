@@ -0,0 +1,281 @@
+"""
+Single-source shortest paths kept up to date while the graph changes.
+
+DynamicShortestPaths subscribes to a Graph (see Graph.subscribe) and repairs
+its shortest-path tree after each edit instead of rerunning Bellman-Ford:
+
+  - a shorter edge (add_edge, lower set_weight) starts a Dijkstra-style
+    propagation from its head that only visits vertices whose distance
+    improves;
+  - a longer or removed tree edge (remove_edge, higher set_weight,
+    remove_vertex) invalidates the subtree below it, which is re-attached
+    from its unaffected in-neighbors and settled with a Dijkstra restricted
+    to that subtree (Ramalingam-Reps style);
+  - edits of non-tree edges that do not shorten anything cost O(1).
+
+If an invalidated subtree holds more than `max_affected_fraction` of the
+vertices, or the graph has negative weights (where the Dijkstra-based repair
+is not valid), the whole tree is recomputed instead.
+
+    sp = DynamicShortestPaths(g, "A")
+    g.set_weight("A", "B", 7)
+    sp.distance("E"), sp.path("E")
+
+Removing the source vertex closes the structure; its queries then raise
+ValueError.
+"""
+
+import heapq
+import itertools
+
+from Instrumentation import get_instrumentation
+
+INF = float("inf")
+
+
+class DynamicShortestPaths:
+    def __init__(self, graph, source, max_affected_fraction=0.25, instrumentation=None):
+        if source not in graph.out_adj_list:
+            raise ValueError("Source vertex does not exist.")
+        self.graph = graph
+        self.source = source
+        self.max_affected_fraction = max_affected_fraction
+        self.instrumentation = get_instrumentation(instrumentation)
+        self.metrics = {"full_recomputes": 0, "incremental_updates": 0, "touched_vertices": 0}
+        self._counter = itertools.count()
+        self.recompute()
+        graph.subscribe(self._on_change)
+
+    def close(self):
+        """
+        Stop following the graph.
+        """
+        if self.graph is not None:
+            self.graph.unsubscribe(self._on_change)
+            self.graph = None
+            self.instrumentation.add_counters(self.metrics, "dynamic_sssp.")
+
+    # --- queries --------------------------------------------------------------
+
+    def distance(self, vertex):
+        """
+        Shortest distance from the source (inf if unreachable). Raises
+        ValueError once the source has been removed from the graph.
+
+        Time complexity: O(1)
+        """
+        if self.dist is None:
+            raise ValueError("Source vertex was removed from the graph.")
+        if vertex not in self.dist:
+            raise ValueError("Vertex does not exist.")
+        return self.dist[vertex]
+
+    def path(self, vertex):
+        """
+        Shortest path from the source as a list of vertices, or None.
+
+        Time complexity: O(length of the path)
+        """
+        if self.distance(vertex) == INF:
+            return None
+        path = []
+        while vertex is not None:
+            path.append(vertex)
+            vertex = self.pred[vertex]
+        path.reverse()
+        return path
+
+    # --- helpers ----------------------------------------------------------------
+
+    def _weight(self, u, v):
+        return self.graph.get_weight(u, v) if self.graph.weighted else 1
+
+    def _set_pred(self, v, p):
+        old = self.pred[v]
+        if old is not None:
+            self.children[old].discard(v)
+        self.pred[v] = p
+        if p is not None:
+            self.children[p].add(v)
+
+    def _has_negative_weights(self):
+        return self.graph.weighted and any(w < 0 for w in self.graph.weights.values())
+
+    def recompute(self):
+        """
+        Rebuild the whole shortest-path tree: Dijkstra when all weights are
+        non-negative, Bellman-Ford otherwise.
+
+        Time complexity: O(E log V), or O(V * E) with negative weights
+        """
+        graph = self.graph
+        if self.source not in graph.out_adj_list:
+            raise ValueError("Source vertex was removed from the graph.")
+        self.dist = {v: INF for v in graph.out_adj_list}
+        self.pred = {v: None for v in graph.out_adj_list}
+        self.children = {v: set() for v in graph.out_adj_list}
+        self.dist[self.source] = 0
+        self.negative = self._has_negative_weights()
+        if self.negative:
+            self._bellman_ford()
+        else:
+            self._propagate([(0, next(self._counter), self.source)])
+        self.metrics["full_recomputes"] += 1
+
+    def _bellman_ford(self):
+        dist = self.dist
+        for _ in range(len(dist)):
+            updated = False
+            for u in self.graph.out_adj_list:
+                if dist[u] == INF:
+                    continue
+                for v in self.graph.out_adj_list[u]:
+                    nd = dist[u] + self._weight(u, v)
+                    if nd < dist[v] and v != self.source:
+                        dist[v] = nd
+                        self._set_pred(v, u)
+                        updated = True
+            if not updated:
+                break
+
+    def _propagate(self, heap):
+        """
+        Dijkstra from the (distance, tiebreak, vertex) entries in heap, only
+        following edges that improve a distance.
+        """
+        dist = self.dist
+        out_adj = self.graph.out_adj_list
+        touched = 0
+        while heap:
+            d, _, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            touched += 1
+            for v in out_adj[u]:
+                nd = d + self._weight(u, v)
+                if nd < dist[v]:
+                    dist[v] = nd
+                    self._set_pred(v, u)
+                    heapq.heappush(heap, (nd, next(self._counter), v))
+        self.metrics["touched_vertices"] += touched
+
+    def _subtree(self, roots):
+        affected = set()
+        stack = [r for r in roots if r in self.pred]
+        while stack:
+            v = stack.pop()
+            if v in affected:
+                continue
+            affected.add(v)
+            stack.extend(self.children[v])
+        return affected
+
+    def _relax_edge(self, u, v):
+        """
+        Handle an edge u -> v that is new or got shorter.
+        """
+        if self.dist[u] == INF:
+            return
+        nd = self.dist[u] + self._weight(u, v)
+        if nd < self.dist[v]:
+            self.dist[v] = nd
+            self._set_pred(v, u)
+            self._propagate([(nd, next(self._counter), v)])
+
+    def _repair(self, roots):
+        """
+        Distances of the subtrees below `roots` may have grown: reset them and
+        settle them again from their unaffected in-neighbors.
+        """
+        affected = self._subtree(roots)
+        affected.discard(self.source)
+        if not affected:
+            return
+        if len(affected) > self.max_affected_fraction * len(self.dist):
+            self.recompute()
+            return
+        dist = self.dist
+        for x in affected:
+            dist[x] = INF
+            self._set_pred(x, None)
+        in_adj = self.graph.in_adj_list
+        heap = []
+        for x in affected:
+            best, best_pred = INF, None
+            for y in in_adj[x]:
+                if y not in affected and dist[y] != INF:
+                    nd = dist[y] + self._weight(y, x)
+                    if nd < best:
+                        best, best_pred = nd, y
+            if best_pred is not None:
+                dist[x] = best
+                self._set_pred(x, best_pred)
+                heap.append((best, next(self._counter), x))
+        heapq.heapify(heap)
+        self._propagate(heap)
+
+    def _edge_directions(self, u, v):
+        if self.graph.directed:
+            return ((u, v),)
+        return ((u, v), (v, u))
+
+    # --- graph events -------------------------------------------------------------
+
+    def _on_change(self, event, *args):
+        graph = self.graph
+        if self.source not in graph.out_adj_list:
+            # Nothing left to maintain: stop following the graph and make
+            # the queries fail instead of answering from stale data.
+            self.close()
+            self.dist = self.pred = self.children = None
+            return
+        if event == "reset":
+            self.recompute()
+            return
+        if self.negative or (event in ("add_edge", "set_weight") and graph.weighted and args[2] < 0):
+            self.recompute()
+            return
+        self.metrics["incremental_updates"] += 1
+
+        if event == "add_vertex":
+            self.dist[args[0]] = INF
+            self.pred[args[0]] = None
+            self.children[args[0]] = set()
+        elif event == "add_vertices":
+            for v in args[0]:
+                self.dist[v] = INF
+                self.pred[v] = None
+                self.children[v] = set()
+        elif event == "add_edge":
+            for a, b in self._edge_directions(args[0], args[1]):
+                self._relax_edge(a, b)
+        elif event == "add_edges":
+            if graph.weighted and any(w < 0 for _, _, w in args[0]):
+                self.recompute()
+                return
+            for u, v, _ in args[0]:
+                for a, b in self._edge_directions(u, v):
+                    self._relax_edge(a, b)
+        elif event == "set_weight":
+            roots = []
+            for a, b in self._edge_directions(args[0], args[1]):
+                if self.pred[b] == a and self.dist[a] + args[2] > self.dist[b]:
+                    roots.append(b)
+            if roots:
+                self._repair(roots)
+            for a, b in self._edge_directions(args[0], args[1]):
+                self._relax_edge(a, b)
+        elif event in ("remove_edge", "remove_edges"):
+            pairs = [(args[0], args[1])] if event == "remove_edge" else args[0]
+            roots = [b for u, v in pairs for a, b in self._edge_directions(u, v) if self.pred[b] == a]
+            self._repair(roots)
+        elif event == "remove_vertex":
+            vertex = args[0]
+            orphans = list(self.children.pop(vertex))
+            for child in orphans:
+                self.pred[child] = None
+            if self.pred[vertex] is not None:
+                self.children[self.pred[vertex]].discard(vertex)
+            del self.dist[vertex]
+            del self.pred[vertex]
+            self._repair(orphans)
@@ -0,0 +1,530 @@
+"""
+Out-of-core loading for edge files that do not fit in memory.
+
+build_csr_file turns a graph file in the create_from_file format into a
+compressed sparse row (CSR) file in three streaming steps:
+
+  1. the edge lines are read in chunks of `run_edges` edges; each chunk is
+     sorted by (source, target) vertex id and written to a temporary run file;
+  2. the sorted runs are merged (heapq.merge), at most `merge_fan_in` at a
+     time: while there are more runs than that, groups of them are merged
+     into larger runs, so the number of open files and read buffers stays
+     bounded. The last merge yields every edge once in source order, so the
+     targets and weights are appended to the CSR arrays sequentially and
+     duplicate edges are caught on the way;
+  3. the arrays are copied into one file together with the vertex names.
+
+Only the vertex names (a dict name -> id), one run and the offset array are
+held in memory, so the memory used is O(V + run_edges), independent of E.
+
+open_csr_file maps the file with mmap and returns a read-only MappedGraph
+with the read API of Graph (like SharedGraph), so BFSIterator and
+bellman_ford run on it unchanged. csr_bfs and csr_bellman_ford work on the
+vertex ids and the mapped arrays directly, without building per-vertex
+objects, and only touch the pages they need.
+
+    build_csr_file("edges.txt", "edges.csr", run_edges=1000000)
+    with open_csr_file("edges.csr") as graph:
+        csr_bellman_ford(graph, "A", "E")
+
+Incoming edges of directed graphs are not stored.
+"""
+
+import argparse
+import array
+import bisect
+import collections
+import heapq
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import time
+
+from Instrumentation import get_instrumentation
+from SharedGraph import SharedAdjacency
+
+_MAGIC = b"GRAPHCSR"
+_FORMAT = 1
+# magic, format, flags, V, entries (out edges), names bytes, edge_count
+_HEADER = struct.Struct("<8s6q")
+_RECORD = struct.Struct("<qqd")  # source id, target id, weight
+
+_DIRECTED = 1
+_WEIGHTED = 2
+_INT_WEIGHTS = 4
+
+DEFAULT_RUN_EDGES = 1000000
+MERGE_FAN_IN = 64
+_READ_RECORDS = 8192
+
+
+def _layout(flags, n, entries, names_len):
+    """
+    Byte offsets of every section. Numeric sections come first and are all
+    8-byte items, so they stay aligned.
+    """
+    sections = {}
+    offset = _HEADER.size
+
+    def add(name, items):
+        nonlocal offset
+        sections[name] = (offset, items)
+        offset += 8 * items
+
+    add("offsets", n + 1)
+    add("targets", entries)
+    if flags & _WEIGHTED:
+        add("weights", entries)
+    add("name_offsets", n + 1)
+    add("sorted_ids", n)
+    sections["names"] = (offset, names_len)
+    return sections, offset + names_len
+
+
+def _write_run(records, tmp_dir):
+    records.sort()
+    f = tempfile.NamedTemporaryFile(dir=tmp_dir, prefix="csr-run-", delete=False)
+    with f:
+        pack = _RECORD.pack
+        f.write(b"".join(pack(*r) for r in records))
+    return f.name
+
+
+def _read_run(filename):
+    with open(filename, "rb") as f:
+        while True:
+            chunk = f.read(_RECORD.size * _READ_RECORDS)
+            if not chunk:
+                break
+            yield from _RECORD.iter_unpack(chunk)
+
+
+def _merge_runs(filenames, tmp_dir):
+    """
+    Merge sorted run files into one new sorted run file.
+    """
+    f = tempfile.NamedTemporaryFile(dir=tmp_dir, prefix="csr-run-", delete=False)
+    try:
+        with f:
+            pack = _RECORD.pack
+            buf = []
+            for record in heapq.merge(*(_read_run(r) for r in filenames)):
+                buf.append(pack(*record))
+                if len(buf) >= _READ_RECORDS:
+                    f.write(b"".join(buf))
+                    buf = []
+            f.write(b"".join(buf))
+    except BaseException:
+        os.remove(f.name)
+        raise
+    return f.name
+
+
+def _parse_weight(w):
+    try:
+        return int(w)
+    except ValueError:
+        return float(w)
+
+
+def build_csr_file(edge_file, csr_file, run_edges=DEFAULT_RUN_EDGES, tmp_dir=None,
+                   merge_fan_in=MERGE_FAN_IN):
+    """
+    Convert a graph file (create_from_file format) into a CSR file that
+    open_csr_file can map. Returns (V, E).
+
+    Time complexity: O(E log E), memory O(V + run_edges + merge_fan_in)
+    """
+    if run_edges < 1:
+        raise ValueError("run_edges must be at least 1.")
+    if merge_fan_in < 2:
+        raise ValueError("merge_fan_in must be at least 2.")
+    index = {}
+    runs = []  # sorted run files not merged yet
+    temp_files = []  # targets / weights sections
+    records = []
+    entries = 0
+    self_loops = 0
+    int_weights = True
+
+    def vertex_id(name):
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(index)
+        return i
+
+    try:
+        with open(edge_file, "r") as f:
+            first_line = f.readline().split()
+            if not first_line:
+                raise ValueError("Empty file.")
+            if len(first_line) != 2:
+                raise ValueError("First line must contain two words indicating graph type.")
+            directed = first_line[0].lower() == "directed"
+            weighted = first_line[1].lower() == "weighted"
+
+            # 1. sorted runs
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                if len(parts) == 1:
+                    vertex_id(parts[0])
+                    continue
+                if len(parts) == 2:
+                    w = 0
+                elif len(parts) == 3:
+                    w = _parse_weight(parts[2])
+                    int_weights = int_weights and isinstance(w, int)
+                else:
+                    raise ValueError("Invalid line format in file.")
+                u = vertex_id(parts[0])
+                v = vertex_id(parts[1])
+                records.append((u, v, w))
+                if not directed:
+                    if u == v:
+                        self_loops += 1
+                    else:
+                        records.append((v, u, w))
+                if len(records) >= run_edges:
+                    runs.append(_write_run(records, tmp_dir))
+                    entries += len(records)
+                    records = []
+        if records:
+            runs.append(_write_run(records, tmp_dir))
+            entries += len(records)
+            records = []
+
+        names = list(index)
+        del index
+        n = len(names)
+        flags = (_DIRECTED if directed else 0) | (_WEIGHTED if weighted else 0)
+        if weighted and int_weights:
+            flags |= _INT_WEIGHTS
+
+        # 2. merge into the CSR arrays (first down to merge_fan_in runs)
+        while len(runs) > merge_fan_in:
+            group = runs[:merge_fan_in]
+            merged = _merge_runs(group, tmp_dir)
+            runs.append(merged)
+            del runs[:merge_fan_in]
+            for r in group:
+                os.remove(r)
+        offsets = array.array("q", bytes(8 * (n + 1)))
+        targets_file = tempfile.NamedTemporaryFile(dir=tmp_dir, prefix="csr-targets-", delete=False)
+        temp_files.append(targets_file.name)
+        weights_file = tempfile.NamedTemporaryFile(dir=tmp_dir, prefix="csr-weights-", delete=False)
+        temp_files.append(weights_file.name)
+        with targets_file, weights_file:
+            target_buf = array.array("q")
+            weight_buf = array.array("d")
+            previous = None
+            for u, v, w in heapq.merge(*(_read_run(r) for r in runs)):
+                if (u, v) == previous:
+                    raise ValueError(f"Edge already exists: {names[u]} {names[v]}")
+                previous = (u, v)
+                offsets[u + 1] += 1
+                target_buf.append(v)
+                if weighted:
+                    weight_buf.append(w)
+                if len(target_buf) >= _READ_RECORDS:
+                    target_buf.tofile(targets_file)
+                    weight_buf.tofile(weights_file)
+                    target_buf = array.array("q")
+                    weight_buf = array.array("d")
+            target_buf.tofile(targets_file)
+            weight_buf.tofile(weights_file)
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        # 3. assemble the file
+        encoded = [name.encode("utf-8") for name in names]
+        name_offsets = array.array("q", [0])
+        for b in encoded:
+            name_offsets.append(name_offsets[-1] + len(b))
+        sorted_ids = array.array("q", sorted(range(n), key=names.__getitem__))
+        edge_count = entries if directed else (entries + self_loops) // 2
+        with open(csr_file, "wb") as out:
+            out.write(_HEADER.pack(_MAGIC, _FORMAT, flags, n, entries, name_offsets[-1], edge_count))
+            offsets.tofile(out)
+            for part in ((targets_file.name, weights_file.name) if weighted else (targets_file.name,)):
+                with open(part, "rb") as src:
+                    shutil.copyfileobj(src, out)
+            name_offsets.tofile(out)
+            sorted_ids.tofile(out)
+            out.write(b"".join(encoded))
+        return n, edge_count
+    finally:
+        for r in runs + temp_files:
+            try:
+                os.remove(r)
+            except OSError:
+                pass
+
+
+class MappedGraph:
+    """
+    Read-only graph backed by a memory-mapped CSR file (see build_csr_file).
+    Vertices have integer ids; names are decoded from the file on demand.
+
+    Time complexity: O(1) to open, O(log V) to find a vertex by name,
+    O(log d) for is_edge / get_weight.
+    """
+
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        self._views = [buf]
+        magic, fmt, flags, n, entries, names_len, edge_count = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or fmt != _FORMAT:
+            self.close()
+            raise ValueError("File is not a CSR graph.")
+        self.directed = bool(flags & _DIRECTED)
+        self.weighted = bool(flags & _WEIGHTED)
+        self._int_weights = bool(flags & _INT_WEIGHTS)
+        self.n = n
+        self.edge_count = edge_count
+        sections, _ = _layout(flags, n, entries, names_len)
+
+        def view(section):
+            offset, items = sections[section]
+            v = buf[offset:offset + 8 * items].cast("d" if section == "weights" else "q")
+            self._views.append(v)
+            return v
+
+        self.offsets = view("offsets")
+        self.targets = view("targets")
+        self.weights = view("weights") if self.weighted else None
+        self._name_offsets = view("name_offsets")
+        self._sorted_ids = view("sorted_ids")
+        offset, length = sections["names"]
+        self._names = buf[offset:offset + length]
+        self._views.append(self._names)
+
+        self.out_adj_list = SharedAdjacency(self, self.offsets, self.targets)
+        self.in_adj_list = None if self.directed else self.out_adj_list
+
+    def close(self):
+        for v in reversed(self._views):
+            v.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def vertex_name(self, i):
+        return bytes(self._names[self._name_offsets[i]:self._name_offsets[i + 1]]).decode("utf-8")
+
+    def vertex_index(self, vertex):
+        """
+        Id of a vertex name, or None. Binary search over the sorted ids.
+        """
+        if not isinstance(vertex, str):
+            return None
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.vertex_name(self._sorted_ids[mid]) < vertex:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n and self.vertex_name(self._sorted_ids[lo]) == vertex:
+            return self._sorted_ids[lo]
+        return None
+
+    def get_v(self):
+        return self.n
+
+    def get_e(self):
+        return self.edge_count
+
+    def get_vertices(self):
+        return list(self.out_adj_list)
+
+    def is_edge(self, u, v):
+        if u not in self.out_adj_list or v not in self.out_adj_list:
+            raise ValueError("One or both vertices do not exist.")
+        return v in self.out_adj_list[u]
+
+    def out_neighbors(self, vertex):
+        return list(self.out_neighbors_view(vertex))
+
+    def out_neighbors_view(self, vertex):
+        if vertex not in self.out_adj_list:
+            raise ValueError("Vertex does not exist.")
+        return self.out_adj_list[vertex]
+
+    def in_neighbors_view(self, vertex):
+        if self.directed:
+            raise ValueError("Incoming edges are not stored for directed external graphs.")
+        return self.out_neighbors_view(vertex)
+
+    def get_weight(self, u, v):
+        if not self.weighted:
+            raise ValueError("Graph is unweighted.")
+        i = self.vertex_index(u)
+        j = self.vertex_index(v)
+        if i is not None and j is not None:
+            start, end = self.offsets[i], self.offsets[i + 1]
+            k = bisect.bisect_left(self.targets, j, start, end)
+            if k < end and self.targets[k] == j:
+                w = self.weights[k]
+                return int(w) if self._int_weights else w
+        raise ValueError("Edge does not exist.")
+
+
+def open_csr_file(filename):
+    """
+    Map a CSR file written by build_csr_file.
+    """
+    return MappedGraph(filename)
+
+
+def _start_id(graph, start):
+    i = graph.vertex_index(start)
+    if i is None:
+        raise ValueError("Start vertex does not exist in the graph.")
+    return i
+
+
+def csr_bfs(graph, start):
+    """
+    Breadth first traversal of a MappedGraph, yielding (vertex, distance)
+    like BFSIterator. Visited vertices are one byte each.
+
+    Time complexity: O(V + E), memory O(V) bytes
+    """
+    offsets, targets = graph.offsets, graph.targets
+    s = _start_id(graph, start)
+    visited = bytearray(graph.n)
+    visited[s] = 1
+    queue = collections.deque([(s, 0)])
+    while queue:
+        u, dist = queue.popleft()
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            if not visited[v]:
+                visited[v] = 1
+                queue.append((v, dist + 1))
+        yield graph.vertex_name(u), dist
+
+
+def csr_bellman_ford(graph, start, goal, instrumentation=None):
+    """
+    bellman_ford over a MappedGraph: every pass scans the CSR arrays in file
+    order, so the pages are read sequentially. Returns the same dictionary as
+    bellman_ford (cost, path, time, metrics).
+
+    Time complexity: O(V * E), memory O(V)
+    """
+    inst = get_instrumentation(instrumentation)
+    start_time = time.perf_counter_ns()
+    s = _start_id(graph, start)
+    g = graph.vertex_index(goal)
+    if g is None:
+        raise ValueError("Goal vertex does not exist in the graph.")
+    n = graph.n
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    inf = float("inf")
+    dist = array.array("d", [inf]) * n
+    pred = array.array("q", [-1]) * n
+    dist[s] = 0
+    counters = {"g.cost": 0}
+    for _ in range(n + 1):
+        updated = False
+        for u in range(n):
+            du = dist[u]
+            start_k, end_k = offsets[u], offsets[u + 1]
+            counters["g.cost"] += end_k - start_k
+            if du == inf:
+                continue
+            for k in range(start_k, end_k):
+                v = targets[k]
+                nd = du + (weights[k] if weights is not None else 1)
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pred[v] = u
+                    updated = True
+        if not updated:
+            break
+    end_time = time.perf_counter_ns()
+    inst.add_counters(counters, "bellman_ford.")
+    inst.add_time("bellman_ford", end_time - start_time)
+
+    path = None
+    cost = dist[g]
+    if cost != inf:
+        path = []
+        current = g
+        while current != -1:
+            path.append(graph.vertex_name(current))
+            current = pred[current]
+        path.reverse()
+        if graph._int_weights or not graph.weighted:
+            cost = int(cost)
+    return {
+        "cost": cost,
+        "path": path,
+        "time": (end_time - start_time) / 1e6,
+        "metrics": counters
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core CSR graphs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="convert a graph file into a CSR file")
+    build.add_argument("graph", help="graph file (create_from_file format)")
+    build.add_argument("output", help="CSR file to write")
+    build.add_argument("--run-edges", type=int, default=DEFAULT_RUN_EDGES,
+                       help="edges sorted in memory per run")
+    build.add_argument("--merge-fan-in", type=int, default=MERGE_FAN_IN,
+                       help="runs merged at a time")
+    build.add_argument("--tmp-dir", help="directory for the temporary run files")
+
+    bfs = sub.add_parser("bfs", help="BFS over a CSR file")
+    bfs.add_argument("csr")
+    bfs.add_argument("start")
+
+    bf = sub.add_parser("bellman-ford", help="Bellman-Ford over a CSR file")
+    bf.add_argument("csr")
+    bf.add_argument("start")
+    bf.add_argument("goal")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "build":
+            n, e = build_csr_file(args.graph, args.output, args.run_edges, args.tmp_dir,
+                                  args.merge_fan_in)
+            print(f"Wrote {args.output}: {n} vertices, {e} edges.")
+        elif args.command == "bfs":
+            with open_csr_file(args.csr) as graph:
+                reached = 0
+                depth = 0
+                for _, dist in csr_bfs(graph, args.start):
+                    reached += 1
+                    depth = dist
+                print(f"Reached {reached} vertices, depth {depth}.")
+        else:
+            with open_csr_file(args.csr) as graph:
+                result = csr_bellman_ford(graph, args.start, args.goal)
+                print(f"Cost: {result['cost']}")
+                print("Path:", " -> ".join(result["path"]) if result["path"] else None)
+                print(f"Time: {result['time']:.3f} ms")
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,167 @@
+"""
+Seeded synthetic graph generators used by the benchmark suite.
+
+Every generator returns a tuple (graph, positions) where graph is an
+undirected weighted Graph with string vertex names ("1", "2", ...) like the
+ones read by Graph.create_from_file, and positions is a dict
+vertex -> (x, y) like the one loaded from the Positions CSV.
+The same seed always produces the same graph.
+"""
+
+import math
+import random
+
+from Lab01 import Graph
+
+
+def _new_graph(n, rng, positions=None):
+    g = Graph(directed=False, weighted=True)
+    vertices = [str(i) for i in range(1, n + 1)]
+    for v in vertices:
+        g.add_vertex(v)
+    if positions is None:
+        positions = {v: (rng.uniform(-1, 1), rng.uniform(-1, 1)) for v in vertices}
+    return g, vertices, positions
+
+
+def _distance_weight(positions, u, v):
+    (x1, y1), (x2, y2) = positions[u], positions[v]
+    return round(math.hypot(x2 - x1, y2 - y1) * 1000) + 1
+
+
+def random_geometric_graph(n, radius, seed=0):
+    """
+    Place n vertices uniformly in [-1, 1]^2 and connect every pair closer
+    than `radius`. Weights are the (scaled) euclidean distances, so the GBFS
+    heuristic is meaningful on these graphs.
+
+    Uses a grid of buckets of size `radius` so only neighbouring cells are
+    compared. Time complexity: O(n + E) expected
+    """
+    rng = random.Random(seed)
+    g, vertices, positions = _new_graph(n, rng)
+    buckets = {}
+    for v in vertices:
+        x, y = positions[v]
+        cell = (int((x + 1) // radius), int((y + 1) // radius))
+        buckets.setdefault(cell, []).append(v)
+
+    r2 = radius * radius
+    for (cx, cy), members in buckets.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                others = buckets.get((cx + dx, cy + dy))
+                if not others:
+                    continue
+                for u in members:
+                    ux, uy = positions[u]
+                    for v in others:
+                        if u >= v:  # each pair once
+                            continue
+                        vx, vy = positions[v]
+                        if (ux - vx) ** 2 + (uy - vy) ** 2 <= r2:
+                            g.add_edge(u, v, _distance_weight(positions, u, v))
+    return g, positions
+
+
+def grid_graph(rows, cols, seed=0, drop_probability=0.1):
+    """
+    Road-like graph: a rows x cols grid with slightly jittered positions where
+    each street (edge) is dropped with `drop_probability`.
+
+    Time complexity: O(rows * cols)
+    """
+    rng = random.Random(seed)
+    positions = {}
+    for r in range(rows):
+        for c in range(cols):
+            positions[str(r * cols + c + 1)] = (c + rng.uniform(-0.3, 0.3), r + rng.uniform(-0.3, 0.3))
+    g, vertices, positions = _new_graph(rows * cols, rng, positions)
+    for r in range(rows):
+        for c in range(cols):
+            u = str(r * cols + c + 1)
+            if c + 1 < cols and rng.random() >= drop_probability:
+                v = str(r * cols + c + 2)
+                g.add_edge(u, v, _distance_weight(positions, u, v))
+            if r + 1 < rows and rng.random() >= drop_probability:
+                v = str((r + 1) * cols + c + 1)
+                g.add_edge(u, v, _distance_weight(positions, u, v))
+    return g, positions
+
+
+def erdos_renyi_graph(n, m, seed=0, max_weight=100):
+    """
+    G(n, m) Erdős–Rényi graph: m distinct edges chosen uniformly at random.
+
+    Time complexity: O(n + m) expected (for m well below n^2 / 2)
+    """
+    if m > n * (n - 1) // 2:
+        raise ValueError("Too many edges for the number of vertices.")
+    rng = random.Random(seed)
+    g, vertices, positions = _new_graph(n, rng)
+    added = 0
+    while added < m:
+        u = vertices[rng.randrange(n)]
+        v = vertices[rng.randrange(n)]
+        if u == v or v in g.out_adj_list[u]:
+            continue
+        g.add_edge(u, v, rng.randint(1, max_weight))
+        added += 1
+    return g, positions
+
+
+def dense_graph(n, density=0.9, seed=0, max_weight=100):
+    """
+    Dense graph: every pair is connected with probability `density`.
+
+    Time complexity: O(n^2)
+    """
+    rng = random.Random(seed)
+    g, vertices, positions = _new_graph(n, rng)
+    for i in range(n):
+        for j in range(i + 1, n):
+            if rng.random() < density:
+                g.add_edge(vertices[i], vertices[j], rng.randint(1, max_weight))
+    return g, positions
+
+
+def random_tree(n, seed=0, max_weight=100):
+    """
+    Random recursive tree: vertex i is attached to a uniformly chosen
+    earlier vertex.
+
+    Time complexity: O(n)
+    """
+    rng = random.Random(seed)
+    g, vertices, positions = _new_graph(n, rng)
+    for i in range(1, n):
+        parent = vertices[rng.randrange(i)]
+        g.add_edge(parent, vertices[i], rng.randint(1, max_weight))
+    return g, positions
+
+
+def generate(kind, edges, seed=0):
+    """
+    Build a graph of the given kind with roughly `edges` edges.
+
+    kind: "geometric", "grid", "erdos_renyi", "dense" or "tree"
+    """
+    if kind == "geometric":
+        n = max(2, edges // 5)  # average degree around 10
+        radius = math.sqrt(2 * edges / (n * (n - 1) * math.pi)) * 2
+        return random_geometric_graph(n, radius, seed)
+    if kind == "grid":
+        side = max(2, int(math.sqrt(edges / 1.8)))
+        return grid_graph(side, side, seed)
+    if kind == "erdos_renyi":
+        n = max(2, edges // 4)
+        return erdos_renyi_graph(n, min(edges, n * (n - 1) // 2), seed)
+    if kind == "dense":
+        n = max(2, int((1 + math.sqrt(1 + 8 * edges / 0.9)) / 2))
+        return dense_graph(n, 0.9, seed)
+    if kind == "tree":
+        return random_tree(edges + 1, seed)
+    raise ValueError(f"Unknown graph kind: {kind}")
+
+
+GENERATORS = ("geometric", "grid", "erdos_renyi", "dense", "tree")
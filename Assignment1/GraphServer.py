@@ -0,0 +1,415 @@
+"""
+Local asyncio query server holding one graph in memory, plus a load
+generator client.
+
+Protocol: newline-delimited JSON over TCP. Every request is one JSON object
+with an "op" (and optionally an "id" echoed back); every reply is one JSON
+object {"id", "ok": true, "result": ...} or {"id", "ok": false, "error": ...}.
+
+Queries:
+    {"op": "path", "start": S, "goal": G}          Bellman-Ford cost and path
+    {"op": "gbfs", "start": S, "goal": G}          GBFS path (needs positions);
+                                                   optional "mode", "epsilon",
+                                                   "beam_width", "max_expansions",
+                                                   "time_limit_ms" bound the search
+    {"op": "bfs_distance", "start": S, "goal": G}  number of edges, or null
+    {"op": "mst_bottleneck", "start": S, "goal": G}
+                                                   largest weight on the MST path
+    {"op": "neighbors", "vertex": V}               outgoing neighbors
+    {"op": "info"}                                 vertex/edge counts, version
+    {"op": "vertices", "limit": N}                 up to N vertex names
+Edits (applied one at a time, in arrival order):
+    {"op": "add_vertex", "vertex": V}      {"op": "remove_vertex", "vertex": V}
+    {"op": "add_edge", "u": U, "v": V, "weight": W}
+    {"op": "remove_edge", "u": U, "v": V}
+    {"op": "set_weight", "u": U, "v": V, "weight": W}
+
+The searches run in a process pool. Each worker receives the graph once (in
+the pool initializer); the edits made since then are sent along with every
+search and replayed by the worker before it answers, so workers never answer
+from a stale graph. After MAX_EDIT_LOG edits the pool is restarted with a
+fresh copy of the graph.
+
+Usage:
+    python GraphServer.py serve InputGraph.txt --port 8765 --positions Positions
+    python GraphServer.py bench --port 8765 --op path --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from Lab01 import Graph
+from Assignment3 import bellman_ford, greedy_best_first_search
+from Assignment4 import kruskal_mst
+from PositionsLoader import load_positions
+
+
+def bfs_distance(graph, start, goal):
+    """
+    Number of edges on a shortest path from start to goal, or None.
+
+    Time complexity: O(V + E)
+    """
+    if start not in graph.out_adj_list or goal not in graph.out_adj_list:
+        raise ValueError("One or both vertices do not exist.")
+    if start == goal:
+        return 0
+    visited = {start}
+    queue = collections.deque([(start, 0)])
+    while queue:
+        vertex, dist = queue.popleft()
+        for neighbor in graph.out_adj_list[vertex]:
+            if neighbor == goal:
+                return dist + 1
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append((neighbor, dist + 1))
+    return None
+
+
+def mst_bottleneck(mst, start, goal):
+    """
+    Largest edge weight on the path between start and goal in a spanning
+    tree/forest, or None if they are in different trees.
+
+    Time complexity: O(V)
+    """
+    if start not in mst.out_adj_list or goal not in mst.out_adj_list:
+        raise ValueError("One or both vertices do not exist.")
+    best = {start: None}
+    queue = collections.deque([start])
+    while queue:
+        vertex = queue.popleft()
+        if vertex == goal:
+            return best[vertex]
+        for neighbor in mst.out_adj_list[vertex]:
+            if neighbor not in best:
+                w = mst.get_weight(vertex, neighbor)
+                best[neighbor] = w if best[vertex] is None else max(best[vertex], w)
+                queue.append(neighbor)
+    return None
+
+
+# --- worker side ------------------------------------------------------------
+
+_worker_data = {}
+
+
+def _init_worker(graph, positions):
+    _worker_data["graph"] = graph
+    _worker_data["positions"] = positions
+    _worker_data["mst"] = None
+    _worker_data["version"] = graph.version
+
+
+def _apply_edits(edits):
+    """
+    Replay the (version, method, args) edits this worker has not seen yet on
+    its copy of the graph.
+    """
+    graph = _worker_data["graph"]
+    for version, method, args in edits:
+        if version > _worker_data["version"]:
+            getattr(graph, method)(*args)
+            _worker_data["version"] = version
+            _worker_data["mst"] = None
+
+
+def _worker_mst():
+    if _worker_data["mst"] is None:
+        _worker_data["mst"] = kruskal_mst(_worker_data["graph"])
+    return _worker_data["mst"]
+
+
+def _task(op, start, goal, options=None, edits=()):
+    _apply_edits(edits)
+    graph = _worker_data["graph"]
+    if start not in graph.out_adj_list or goal not in graph.out_adj_list:
+        raise ValueError("One or both vertices do not exist.")
+    if op == "path":
+        result = bellman_ford(graph, start, goal)
+        return {"cost": result["cost"] if result["path"] else None, "path": result["path"]}
+    if op == "gbfs":
+        positions = _worker_data["positions"]
+        if not positions or start not in positions or goal not in positions:
+            raise ValueError("Position data missing or incomplete.")
+        result = greedy_best_first_search(graph, start, goal, positions, **(options or {}))
+        if options:
+            return {"path": result["path"], "partial_path": result.get("partial_path"),
+                    "expansions": result["metrics"]["expansions"],
+                    "budget_exhausted": bool(result["metrics"]["budget.exhausted"])}
+        return {"path": result["path"]}
+    if op == "bfs_distance":
+        return bfs_distance(graph, start, goal)
+    if op == "mst_bottleneck":
+        if graph.directed:
+            raise ValueError("Graph must be undirected for Kruskal's algorithm.")
+        return mst_bottleneck(_worker_mst(), start, goal)
+    raise ValueError(f"Unknown operation '{op}'.")
+
+
+# --- server side ------------------------------------------------------------
+
+SEARCH_OPS = ("path", "gbfs", "bfs_distance", "mst_bottleneck")
+GBFS_OPTIONS = ("mode", "epsilon", "beam_width", "max_expansions", "time_limit_ms")
+
+# Edits made since the pool was started are sent along with every search and
+# replayed by the workers; once there are more than this many, the pool is
+# restarted with a fresh copy of the graph instead.
+MAX_EDIT_LOG = 256
+
+
+class GraphServer:
+    """
+    Holds the graph and answers requests. Searches are sent to a process
+    pool whose workers got a copy of the graph when the pool started; edits
+    run one at a time under a lock on the event loop and are replayed by the
+    workers (see MAX_EDIT_LOG).
+    """
+
+    def __init__(self, graph, positions=None, workers=None):
+        self.graph = graph
+        self.positions = dict(positions) if positions is not None else None
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.edit_lock = asyncio.Lock()
+        self._pool = None
+        self._pool_version = None
+        self._edits = []  # (version, method, args) since the pool started
+
+    def _get_pool(self):
+        known = self._edits[-1][0] if self._edits else self._pool_version
+        if self._pool is not None and known == self.graph.version and len(self._edits) <= MAX_EDIT_LOG:
+            return self._pool
+        # Also restarted if the graph was changed other than through edit().
+        if self._pool is not None:
+            # Running tasks finish on the old pool, new ones go to the new pool.
+            self._pool.shutdown(wait=False)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self.graph, self.positions))
+        self._pool_version = self.graph.version
+        self._edits = []
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    async def search(self, op, start, goal, options=None):
+        if self.workers <= 0:
+            if self._pool_version != self.graph.version:
+                _init_worker(self.graph, self.positions)
+                self._pool_version = self.graph.version
+            return _task(op, start, goal, options)
+        async with self.edit_lock:  # never snapshot the graph mid-edit
+            pool = self._get_pool()
+            edits = tuple(self._edits)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, _task, op, start, goal, options, edits)
+        except BrokenProcessPool:
+            if self._pool is pool:
+                self._pool = None  # start a new pool for the next search
+            raise
+
+    async def edit(self, request):
+        op = request["op"]
+        g = self.graph
+        if op in ("add_vertex", "remove_vertex"):
+            args = (request["vertex"],)
+        elif op == "add_edge":
+            args = (request["u"], request["v"], request.get("weight", 0))
+        elif op == "remove_edge":
+            args = (request["u"], request["v"])
+        else:
+            args = (request["u"], request["v"], request["weight"])
+        async with self.edit_lock:
+            getattr(g, op)(*args)
+            if self._pool is not None:
+                self._edits.append((g.version, op, args))
+        return {"version": g.version}
+
+    async def handle(self, request):
+        op = request.get("op")
+        if op in SEARCH_OPS:
+            options = {k: request[k] for k in GBFS_OPTIONS if k in request} if op == "gbfs" else None
+            return await self.search(op, request["start"], request["goal"], options)
+        if op == "neighbors":
+            return list(self.graph.out_neighbors_view(request["vertex"]))
+        if op == "vertices":
+            limit = request.get("limit")
+            vertices = self.graph.out_adj_list
+            if limit is None:
+                return list(vertices)
+            return [v for v, _ in zip(vertices, range(int(limit)))]
+        if op == "info":
+            return {"vertices": self.graph.get_v(), "edges": self.graph.get_e(),
+                    "directed": self.graph.directed, "weighted": self.graph.weighted,
+                    "version": self.graph.version}
+        if op in ("add_vertex", "remove_vertex", "add_edge", "remove_edge", "set_weight"):
+            return await self.edit(request)
+        raise ValueError(f"Unknown operation '{op}'.")
+
+    async def _answer(self, line, writer, write_lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object.")
+            request_id = request.get("id")
+            reply = {"id": request_id, "ok": True, "result": await self.handle(request)}
+        except KeyError as e:
+            reply = {"id": request_id, "ok": False, "error": f"missing field {e}"}
+        except (ValueError, TypeError) as e:
+            reply = {"id": request_id, "ok": False, "error": str(e)}
+        except Exception as e:
+            # e.g. a worker process died: still answer so the client does not wait forever
+            reply = {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        async with write_lock:
+            writer.write((json.dumps(reply) + "\n").encode())
+            await writer.drain()
+
+    async def serve_client(self, reader, writer):
+        """
+        Requests of one connection are processed concurrently; replies are
+        sent as soon as they are ready (match them by "id").
+        """
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._answer(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def run(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.serve_client, host, port, limit=2 ** 20)
+        print(f"Serving {self.graph.get_v()} vertices / {self.graph.get_e()} edges on {host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+
+# --- load generator -----------------------------------------------------------
+
+async def _bench_connection(host, port, requests, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port, limit=2 ** 20)
+    try:
+        for request in requests:
+            start = time.perf_counter_ns()
+            writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            latencies.append(time.perf_counter_ns() - start)
+            if not reply["ok"]:
+                errors.append(reply["error"])
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, op, total, concurrency, seed=0):
+    """
+    Send `total` random `op` queries over `concurrency` connections (one
+    request in flight per connection). Returns throughput and latency
+    percentiles in milliseconds.
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=2 ** 26)
+    writer.write(b'{"op": "vertices", "limit": 100000}\n')
+    await writer.drain()
+    vertices = json.loads(await reader.readline())["result"]
+    writer.close()
+
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(total):
+        if op == "neighbors":
+            requests.append({"op": op, "vertex": rng.choice(vertices)})
+        else:
+            requests.append({"op": op, "start": rng.choice(vertices), "goal": rng.choice(vertices)})
+    per_connection = [requests[i::concurrency] for i in range(concurrency)]
+
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_bench_connection(host, port, chunk, latencies, errors)
+                           for chunk in per_connection if chunk))
+    elapsed = time.perf_counter() - start
+
+    ms = sorted(x / 1e6 for x in latencies)
+
+    def pct(p):
+        return ms[min(len(ms) - 1, int(len(ms) * p / 100))]
+
+    return {
+        "op": op,
+        "requests": len(ms),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "throughput_rps": len(ms) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(ms),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Graph query server and load generator.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="load a graph and serve queries")
+    serve.add_argument("graph", help="graph file (create_from_file format)")
+    serve.add_argument("--positions", help="positions CSV for gbfs queries")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=int, default=None,
+                       help="search processes (0 = answer on the event loop)")
+
+    bench = sub.add_parser("bench", help="measure throughput and latency of a running server")
+    bench.add_argument("--host", default="127.0.0.1")
+    bench.add_argument("--port", type=int, default=8765)
+    bench.add_argument("--op", default="path", choices=SEARCH_OPS + ("neighbors",))
+    bench.add_argument("--requests", type=int, default=1000)
+    bench.add_argument("--concurrency", type=int, default=16)
+    bench.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        graph = Graph.create_from_file(args.graph)
+        positions = load_positions(args.positions) if args.positions else None
+        server = GraphServer(graph, positions, args.workers)
+        try:
+            asyncio.run(server.run(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    report = asyncio.run(run_load(args.host, args.port, args.op, args.requests, args.concurrency, args.seed))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+Lazy, read-only views over a Graph.
+
+A view looks like a Graph to the algorithms (out_adj_list, in_adj_list,
+get_vertices, get_weight, is_edge, all_neighbors, degree, ...), but it does
+not copy anything: every lookup is answered from the underlying graph, so
+changes to the graph are visible through the view. Call to_graph() to
+materialize a view into a new, independent Graph.
+
+    reverse_view(g)                every edge u -> v seen as v -> u
+    undirected_view(g)             directed graph seen as undirected
+    subgraph_view(g, vertices)     subgraph induced by a vertex set/predicate
+    edge_filter_view(g, keep)      only the edges with keep(u, v) true
+
+Views can be stacked, e.g. subgraph_view(undirected_view(g), {...}).
+"""
+
+import collections.abc
+
+from Lab01 import Graph, UnionNeighborView
+
+
+class FilteredNeighborView(collections.abc.Set):
+    """
+    Read-only view of the neighbors in `neighbors` for which keep(n) is true.
+
+    Time complexity: O(1) for __contains__, O(d) for __len__ and iteration.
+    """
+
+    __slots__ = ("_neighbors", "_keep")
+
+    def __init__(self, neighbors, keep):
+        self._neighbors = neighbors
+        self._keep = keep
+
+    def __contains__(self, vertex):
+        return vertex in self._neighbors and self._keep(vertex)
+
+    def __iter__(self):
+        keep = self._keep
+        return (vertex for vertex in self._neighbors if keep(vertex))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"FilteredNeighborView({list(self)})"
+
+
+class AdjacencyMapping(collections.abc.Mapping):
+    """
+    Read-only mapping vertex -> neighbor set computed on access, used as the
+    out_adj_list / in_adj_list of a view.
+
+    contains(v): is v a vertex of the view
+    iterate():   iterator over the vertices of the view
+    neighbors(v): neighbor set of v
+    """
+
+    __slots__ = ("_contains", "_iterate", "_neighbors")
+
+    def __init__(self, contains, iterate, neighbors):
+        self._contains = contains
+        self._iterate = iterate
+        self._neighbors = neighbors
+
+    def __getitem__(self, vertex):
+        if not self._contains(vertex):
+            raise KeyError(vertex)
+        return self._neighbors(vertex)
+
+    def __contains__(self, vertex):
+        return self._contains(vertex)
+
+    def __iter__(self):
+        return self._iterate()
+
+    def __len__(self):
+        return sum(1 for _ in self._iterate())
+
+
+class GraphView:
+    """
+    Base class of the views. Subclasses set self.out_adj_list,
+    self.in_adj_list (mappings vertex -> neighbor set) and implement
+    _weight(u, v) for edges known to exist.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.directed = graph.directed
+        self.weighted = graph.weighted
+
+    def _weight(self, u, v):
+        return self.graph.get_weight(u, v)
+
+    def get_v(self):
+        """
+        Time complexity: O(V) (O(1) for views that keep all vertices)
+        """
+        return len(self.out_adj_list)
+
+    def get_e(self):
+        """
+        Time complexity: O(V + E), the view does not cache the edge count.
+        """
+        total = 0
+        loops = 0
+        for u, neighbors in self.out_adj_list.items():
+            total += len(neighbors)
+            if u in neighbors:
+                loops += 1
+        if self.directed:
+            return total
+        return (total + loops) // 2
+
+    def get_vertices(self):
+        return list(self.out_adj_list)
+
+    def is_edge(self, u, v):
+        if u not in self.out_adj_list or v not in self.out_adj_list:
+            raise ValueError("One or both vertices do not exist.")
+        return v in self.out_adj_list[u]
+
+    def out_neighbors(self, vertex):
+        return list(self.out_neighbors_view(vertex))
+
+    def in_neighbors(self, vertex):
+        return list(self.in_neighbors_view(vertex))
+
+    def out_neighbors_view(self, vertex):
+        if vertex not in self.out_adj_list:
+            raise ValueError("Vertex does not exist.")
+        return self.out_adj_list[vertex]
+
+    def in_neighbors_view(self, vertex):
+        if vertex not in self.in_adj_list:
+            raise ValueError("Vertex does not exist.")
+        return self.in_adj_list[vertex]
+
+    def all_neighbors(self, vertex):
+        if vertex not in self.out_adj_list:
+            raise ValueError("Vertex does not exist.")
+        if not self.directed:
+            return self.out_adj_list[vertex]
+        return UnionNeighborView(self.out_adj_list[vertex], self.in_adj_list[vertex])
+
+    def degree(self, vertex, mode="all"):
+        if mode == "out":
+            return len(self.out_neighbors_view(vertex))
+        if mode == "in":
+            return len(self.in_neighbors_view(vertex))
+        if mode == "all":
+            return len(self.all_neighbors(vertex))
+        raise ValueError("Mode must be 'out', 'in' or 'all'.")
+
+    def get_weight(self, u, v):
+        if not self.weighted:
+            raise ValueError("Graph is unweighted.")
+        if u not in self.out_adj_list or v not in self.out_adj_list[u]:
+            raise ValueError("Edge does not exist.")
+        return self._weight(u, v)
+
+    def to_graph(self):
+        """
+        Materialize the view into a new, independent Graph.
+
+        Time complexity: O(V + E)
+        """
+        g = Graph(directed=self.directed, weighted=self.weighted)
+        for v in self.out_adj_list:
+            g.add_vertex(v)
+        for u, neighbors in self.out_adj_list.items():
+            for v in neighbors:
+                if not self.directed and v in g.out_adj_list[u]:
+                    continue  # undirected edge already added from v
+                g.add_edge(u, v, self._weight(u, v) if self.weighted else 0)
+        return g
+
+    def __str__(self):
+        return str(self.to_graph())
+
+
+class ReverseView(GraphView):
+    """
+    The graph with every edge reversed. For undirected graphs it is the graph
+    itself. Time complexity: O(1) to create, same costs as the Graph after.
+    """
+
+    def __init__(self, graph):
+        super().__init__(graph)
+        self.out_adj_list = graph.in_adj_list
+        self.in_adj_list = graph.out_adj_list
+
+    def _weight(self, u, v):
+        if self.directed:
+            return self.graph.get_weight(v, u)
+        return self.graph.get_weight(u, v)
+
+
+class UndirectedView(GraphView):
+    """
+    A directed graph seen as undirected: u and v are adjacent if u -> v or
+    v -> u. If both edges exist, the pair gets the smaller of the two
+    weights, so get_weight(u, v) == get_weight(v, u) and to_graph() stores
+    the same weight the view reports.
+    """
+
+    def __init__(self, graph):
+        super().__init__(graph)
+        self.directed = False
+        if not graph.directed:
+            self.out_adj_list = graph.out_adj_list
+            self.in_adj_list = graph.in_adj_list
+        else:
+            out_adj, in_adj = graph.out_adj_list, graph.in_adj_list
+            adjacency = AdjacencyMapping(
+                out_adj.__contains__,
+                lambda: iter(out_adj),
+                lambda v: UnionNeighborView(out_adj[v], in_adj[v]),
+            )
+            self.out_adj_list = adjacency
+            self.in_adj_list = adjacency
+
+    def get_v(self):
+        return len(self.graph.out_adj_list)
+
+    def _weight(self, u, v):
+        graph = self.graph
+        if not graph.directed:
+            return graph.get_weight(u, v)
+        forward = v in graph.out_adj_list[u]
+        backward = u in graph.out_adj_list[v]
+        if forward and backward:
+            return min(graph.get_weight(u, v), graph.get_weight(v, u))
+        return graph.get_weight(u, v) if forward else graph.get_weight(v, u)
+
+
+class SubgraphView(GraphView):
+    """
+    Subgraph induced by a set of vertices. `vertices` is either a container
+    (set, dict, ...) or a predicate vertex -> bool.
+    """
+
+    def __init__(self, graph, vertices):
+        super().__init__(graph)
+        if callable(vertices):
+            keep = vertices
+        else:
+            keep = vertices.__contains__
+        base_out, base_in = graph.out_adj_list, graph.in_adj_list
+
+        def contains(v):
+            return v in base_out and keep(v)
+
+        def iterate():
+            return (v for v in base_out if keep(v))
+
+        self.out_adj_list = AdjacencyMapping(contains, iterate,
+                                             lambda v: FilteredNeighborView(base_out[v], keep))
+        self.in_adj_list = AdjacencyMapping(contains, iterate,
+                                            lambda v: FilteredNeighborView(base_in[v], keep))
+
+
+class EdgeFilterView(GraphView):
+    """
+    Keeps every vertex but only the edges u -> v for which keep(u, v) is
+    true. For undirected graphs keep should be symmetric.
+    """
+
+    def __init__(self, graph, keep):
+        super().__init__(graph)
+        base_out, base_in = graph.out_adj_list, graph.in_adj_list
+        self.out_adj_list = AdjacencyMapping(
+            base_out.__contains__,
+            lambda: iter(base_out),
+            lambda u: FilteredNeighborView(base_out[u], lambda v: keep(u, v)),
+        )
+        self.in_adj_list = AdjacencyMapping(
+            base_in.__contains__,
+            lambda: iter(base_in),
+            lambda v: FilteredNeighborView(base_in[v], lambda u: keep(u, v)),
+        )
+
+    def get_v(self):
+        return len(self.graph.out_adj_list)
+
+
+def reverse_view(graph):
+    return ReverseView(graph)
+
+
+def undirected_view(graph):
+    return UndirectedView(graph)
+
+
+def subgraph_view(graph, vertices):
+    return SubgraphView(graph, vertices)
+
+
+def edge_filter_view(graph, keep):
+    return EdgeFilterView(graph, keep)
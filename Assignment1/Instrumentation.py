@@ -0,0 +1,215 @@
+"""
+Shared instrumentation for the graph algorithms.
+
+Every algorithm accepts an optional `instrumentation` argument. When it is
+None the algorithm uses NULL_INSTRUMENTATION, whose methods do nothing, so
+running without metrics costs (almost) nothing. Algorithms keep their counters
+in local variables while running and flush them once at the end.
+
+Example:
+    inst = Instrumentation(track_memory=True, profile_path="gbfs.prof")
+    with inst:
+        greedy_best_first_search(g, "A", "E", positions, instrumentation=inst)
+    print(inst.to_json(indent=2))
+"""
+
+import contextlib
+import time
+
+
+class Instrumentation:
+    """
+    Collects counters, perf_counter_ns timings and (optionally) peak memory
+    and a cProfile dump.
+
+    Counters: name -> int
+    Timings:  name -> list of durations in nanoseconds (one per timed call)
+
+    Used as a context manager it starts/stops tracemalloc and cProfile.
+    """
+
+    enabled = True
+
+    def __init__(self, track_memory=False, profile_path=None):
+        self.track_memory = track_memory
+        self.profile_path = profile_path
+        self.counters = {}
+        self.timings = {}
+        self.peak_memory = None
+        self._profiler = None
+        self._started_tracemalloc = False
+
+    def count(self, name, amount=1):
+        """
+        Increase counter `name` by `amount`.
+
+        Time complexity: O(1)
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_counters(self, counters, prefix=""):
+        """
+        Add every counter from a dict (e.g. the "metrics" dict of an algorithm).
+
+        Time complexity: O(k) where k is the number of counters
+        """
+        for name, amount in counters.items():
+            self.count(prefix + name, amount)
+
+    def add_time(self, name, elapsed_ns):
+        """
+        Record one duration (in nanoseconds) for timer `name`.
+
+        Time complexity: O(1)
+        """
+        self.timings.setdefault(name, []).append(elapsed_ns)
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """
+        Context manager that times its body with perf_counter_ns.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter_ns() - start)
+
+    def __enter__(self):
+        # tracemalloc and cProfile are slow to import, so they are only
+        # imported when memory tracking or profiling is switched on.
+        if self.track_memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+        if self.profile_path is not None:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.profile_path)
+            self._profiler = None
+        if self.track_memory:
+            import tracemalloc
+
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak_memory = peak
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        return False
+
+    def reset(self):
+        """
+        Forget all collected counters, timings and memory figures.
+        """
+        self.counters = {}
+        self.timings = {}
+        self.peak_memory = None
+
+    def as_dict(self):
+        """
+        Return the collected data as a plain (JSON serializable) dict.
+        Timings are summarized as count / total / min / max in milliseconds.
+        """
+        timings = {}
+        for name, samples in self.timings.items():
+            timings[name] = {
+                "calls": len(samples),
+                "total_ms": sum(samples) / 1e6,
+                "min_ms": min(samples) / 1e6,
+                "max_ms": max(samples) / 1e6,
+            }
+        result = {"counters": dict(self.counters), "timings": timings}
+        if self.peak_memory is not None:
+            result["peak_memory_bytes"] = self.peak_memory
+        if self.profile_path is not None:
+            result["profile"] = self.profile_path
+        return result
+
+    def to_json(self, indent=None):
+        import json
+
+        return json.dumps(self.as_dict(), indent=indent, sort_keys=True)
+
+    def format_table(self):
+        """
+        Return a human readable table of the collected data.
+        """
+        lines = []
+        if self.counters:
+            lines.append("Counter                         Value")
+            for name in sorted(self.counters):
+                lines.append(f"{name:<31} {self.counters[name]}")
+        if self.timings:
+            lines.append("Timer                           calls  total(ms)  min(ms)")
+            for name, info in sorted(self.as_dict()["timings"].items()):
+                lines.append(f"{name:<31} {info['calls']:<6} {info['total_ms']:<10.3f} {info['min_ms']:.3f}")
+        if self.peak_memory is not None:
+            lines.append(f"Peak memory: {self.peak_memory} bytes")
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.format_table()
+
+
+class NullInstrumentation:
+    """
+    No-op instrumentation used when metrics are disabled.
+    All methods return immediately.
+    """
+
+    enabled = False
+
+    def count(self, name, amount=1):
+        pass
+
+    def add_counters(self, counters, prefix=""):
+        pass
+
+    def add_time(self, name, elapsed_ns):
+        pass
+
+    def timer(self, name):
+        return _NULL_CONTEXT
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def reset(self):
+        pass
+
+    def as_dict(self):
+        return {"counters": {}, "timings": {}}
+
+    def to_json(self, indent=None):
+        import json
+
+        return json.dumps(self.as_dict(), indent=indent, sort_keys=True)
+
+    def format_table(self):
+        return ""
+
+
+_NULL_CONTEXT = contextlib.nullcontext()
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+def get_instrumentation(instrumentation):
+    """
+    Return `instrumentation`, or the shared no-op instance if it is None.
+    """
+    if instrumentation is None:
+        return NULL_INSTRUMENTATION
+    return instrumentation
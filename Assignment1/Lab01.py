@@ -1,4 +1,69 @@
+import array
 import collections
+import collections.abc
+
+from Connectivity import ConnectivityIndex
+from Instrumentation import get_instrumentation
+
+
+class NeighborView(collections.abc.Set):
+    """
+    Read-only, live view of a neighbor set of a Graph.
+
+    Supports iteration, len() and `in` without copying the underlying set.
+    Changes to the graph are visible through the view, so do not modify the
+    graph while iterating over one.
+
+    Time complexity: O(1) to create, __contains__ and __len__
+    """
+
+    __slots__ = ("_neighbors",)
+
+    def __init__(self, neighbors):
+        self._neighbors = neighbors
+
+    def __contains__(self, vertex):
+        return vertex in self._neighbors
+
+    def __iter__(self):
+        return iter(self._neighbors)
+
+    def __len__(self):
+        return len(self._neighbors)
+
+    def __repr__(self):
+        return f"NeighborView({list(self._neighbors)})"
+
+
+class UnionNeighborView(collections.abc.Set):
+    """
+    Read-only view of the union of the outgoing and incoming neighbors of a
+    vertex in a directed graph, without allocating the union.
+
+    Time complexity: O(1) to create and for __contains__,
+    O(d) for __len__ and a full iteration.
+    """
+
+    __slots__ = ("_out", "_in")
+
+    def __init__(self, out_neighbors, in_neighbors):
+        self._out = out_neighbors
+        self._in = in_neighbors
+
+    def __contains__(self, vertex):
+        return vertex in self._out or vertex in self._in
+
+    def __iter__(self):
+        yield from self._out
+        for vertex in self._in:
+            if vertex not in self._out:
+                yield vertex
+
+    def __len__(self):
+        return len(self._out) + sum(1 for vertex in self._in if vertex not in self._out)
+
+    def __repr__(self):
+        return f"UnionNeighborView({list(self)})"
 
 
 class Graph:
@@ -18,6 +83,54 @@ class Graph:
         self.in_adj_list = {}
         self.edge_count = 0
         self.weights = {}
+        # Incremented once per mutation (once per bulk call or transaction),
+        # so derived structures can tell whether they are out of date.
+        self.version = 0
+        self._transaction = None  # innermost open GraphTransaction
+        self._listeners = []
+        self._connectivity = None
+
+    def _changed(self, event=None, *args):
+        """
+        Record that the graph was modified and tell the listeners about it.
+        Inside a transaction the version is only bumped once, when the
+        transaction commits (listeners still see every edit, including the
+        undo edits of a rolled back transaction).
+        """
+        if self._transaction is None:
+            self.version += 1
+        if event is not None and self._listeners:
+            # A listener may unsubscribe while being called.
+            for listener in tuple(self._listeners):
+                listener(event, *args)
+
+    def subscribe(self, listener):
+        """
+        Call listener(event, *args) after every mutation. Events:
+            ("add_vertex", v), ("remove_vertex", v),
+            ("add_edge", u, v, weight), ("remove_edge", u, v),
+            ("set_weight", u, v, weight),
+            ("add_vertices", vertices), ("add_edges", [(u, v, w), ...]),
+            ("remove_edges", [(u, v), ...]),
+            ("reset",) after change_directed / change_weighted.
+        Listeners are not copied or pickled with the graph.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def connectivity(self):
+        """
+        Return the graph's ConnectivityIndex (created on first use), which
+        answers same-component and component-size queries in near O(1) and is
+        kept up to date as vertices and edges are added.
+
+        Time complexity: O(V + E) the first time and after removals, O(1) otherwise
+        """
+        if self._connectivity is None:
+            self._connectivity = ConnectivityIndex(self)
+        return self._connectivity
 
     def add_vertex(self, vertex):
         """
@@ -29,6 +142,7 @@ class Graph:
             raise ValueError("Vertex already exists.")
         self.out_adj_list[vertex] = set()
         self.in_adj_list[vertex] = set()
+        self._changed("add_vertex", vertex)
 
     def add_edge(self, u, v, weight=0):
         """
@@ -61,6 +175,7 @@ class Graph:
             if self.weighted:
                 key = frozenset({u, v})
                 self.weights[key] = weight
+        self._changed("add_edge", u, v, weight)
 
     def remove_edge(self, u, v):
         """
@@ -90,6 +205,7 @@ class Graph:
             if self.weighted:
                 key = frozenset({u, v})
                 del self.weights[key]
+        self._changed("remove_edge", u, v)
 
     def remove_vertex(self, vertex):
         """
@@ -124,6 +240,211 @@ class Graph:
                 self.edge_count -= 1
         del self.out_adj_list[vertex]
         del self.in_adj_list[vertex]
+        self._changed("remove_vertex", vertex)
+
+    def add_vertices_from(self, vertices):
+        """
+        Add many vertices at once. The whole batch is validated first, so
+        either every vertex is added or (on ValueError) none is.
+
+        Time complexity: O(k) where k is the number of vertices
+        """
+        vertices = list(vertices)
+        seen = set()
+        for vertex in vertices:
+            if vertex in self.out_adj_list or vertex in seen:
+                raise ValueError(f"Vertex already exists: {vertex}")
+            seen.add(vertex)
+        out_adj, in_adj = self.out_adj_list, self.in_adj_list
+        for vertex in vertices:
+            out_adj[vertex] = set()
+            in_adj[vertex] = set()
+        self._changed("add_vertices", vertices)
+
+    def add_edges_from(self, edges):
+        """
+        Add many edges at once. Each edge is (u, v) or (u, v, weight).
+        The whole batch is validated first (vertices exist, edges are new and
+        not repeated in the batch), so either every edge is added or
+        (on ValueError) none is.
+
+        Time complexity: O(k) average where k is the number of edges
+        """
+        edges = [edge if len(edge) == 3 else (edge[0], edge[1], 0) for edge in edges]
+        out_adj, in_adj = self.out_adj_list, self.in_adj_list
+        seen = set()
+        for u, v, _ in edges:
+            if u not in out_adj or v not in out_adj:
+                raise ValueError(f"One or both vertices do not exist: {u} {v}")
+            if v in out_adj[u] or (u, v) in seen or (not self.directed and (v, u) in seen):
+                raise ValueError(f"Edge already exists: {u} {v}")
+            seen.add((u, v))
+
+        weights = self.weights
+        if self.directed:
+            for u, v, w in edges:
+                out_adj[u].add(v)
+                in_adj[v].add(u)
+            if self.weighted:
+                for u, v, w in edges:
+                    weights[(u, v)] = w
+        else:
+            for u, v, w in edges:
+                out_adj[u].add(v)
+                out_adj[v].add(u)
+                in_adj[u].add(v)
+                in_adj[v].add(u)
+            if self.weighted:
+                for u, v, w in edges:
+                    weights[frozenset({u, v})] = w
+        self.edge_count += len(edges)
+        self._changed("add_edges", edges)
+
+    def remove_edges_from(self, edges):
+        """
+        Remove many edges at once, given as (u, v) pairs (extra items such
+        as weights are ignored). Validated first like add_edges_from.
+
+        Time complexity: O(k) average where k is the number of edges
+        """
+        edges = [(edge[0], edge[1]) for edge in edges]
+        out_adj, in_adj = self.out_adj_list, self.in_adj_list
+        seen = set()
+        for u, v in edges:
+            if u not in out_adj or v not in out_adj[u] or (u, v) in seen \
+                    or (not self.directed and (v, u) in seen):
+                raise ValueError(f"Edge does not exist: {u} {v}")
+            seen.add((u, v))
+
+        weights = self.weights
+        if self.directed:
+            for u, v in edges:
+                out_adj[u].remove(v)
+                in_adj[v].remove(u)
+            if self.weighted:
+                for u, v in edges:
+                    del weights[(u, v)]
+        else:
+            for u, v in edges:
+                out_adj[u].remove(v)
+                out_adj[v].remove(u)
+                in_adj[u].remove(v)
+                in_adj[v].remove(u)
+            if self.weighted:
+                for u, v in edges:
+                    del weights[frozenset({u, v})]
+        self.edge_count -= len(edges)
+        self._changed("remove_edges", edges)
+
+    def transaction(self):
+        """
+        Group several edits into one atomic change:
+
+            with g.transaction() as tx:
+                tx.add_vertex("X")
+                tx.add_edges_from([("X", "A", 3), ("X", "B", 4)])
+                tx.remove_edge("A", "B")
+
+        If any edit fails (or the block raises), every edit already made in the
+        transaction is undone and the exception is re-raised. The version of
+        the graph is bumped once, when the transaction commits.
+
+        Transactions can be nested: a committed inner transaction hands its
+        edits to the outer one, so they are undone if the outer block fails,
+        and the version is only bumped when the outermost one commits.
+        """
+        return GraphTransaction(self)
+
+    def copy(self):
+        """
+        Return an independent copy of the graph.
+
+        Neighbor sets are copied with set.copy() (the mutable parts), while
+        vertex objects and the frozenset weight keys are shared with the
+        original since they are immutable. Much faster than copy.deepcopy.
+
+        Time complexity: O(V + E)
+        """
+        g = Graph.__new__(Graph)
+        g.directed = self.directed
+        g.weighted = self.weighted
+        g.out_adj_list = {v: neighbors.copy() for v, neighbors in self.out_adj_list.items()}
+        g.in_adj_list = {v: neighbors.copy() for v, neighbors in self.in_adj_list.items()}
+        g.edge_count = self.edge_count
+        g.weights = self.weights.copy()
+        g.version = self.version
+        g._transaction = None
+        g._listeners = []
+        g._connectivity = None
+        return g
+
+    def __deepcopy__(self, memo):
+        # Vertices and weights are immutable, so copy() is already a deep copy.
+        return self.copy()
+
+    def __getstate__(self):
+        """
+        Compact pickle state: the vertex list plus the edges as a flat array
+        of vertex indices (each undirected edge once) and a parallel list of
+        weights. Used by pickle (e.g. when sending a graph to worker
+        processes) and copy.copy; copy.deepcopy goes through __deepcopy__.
+
+        Time complexity: O(V + E)
+        """
+        vertices = list(self.out_adj_list)
+        index = {v: i for i, v in enumerate(vertices)}
+        edges = array.array("q")
+        weights = []
+        for u, neighbors in self.out_adj_list.items():
+            i = index[u]
+            for v in neighbors:
+                j = index[v]
+                if not self.directed and j < i:
+                    continue
+                edges.append(i)
+                edges.append(j)
+                if self.weighted:
+                    key = (u, v) if self.directed else frozenset({u, v})
+                    weights.append(self.weights[key])
+        return {
+            "directed": self.directed,
+            "weighted": self.weighted,
+            "vertices": vertices,
+            "edges": edges,
+            "weights": weights,
+            "version": self.version,
+        }
+
+    def __setstate__(self, state):
+        self.directed = state["directed"]
+        self.weighted = state["weighted"]
+        vertices = state["vertices"]
+        edges = state["edges"]
+        out_adj = {v: set() for v in vertices}
+        in_adj = {v: set() for v in vertices}
+        self.weights = {}
+        for k in range(0, len(edges), 2):
+            u = vertices[edges[k]]
+            v = vertices[edges[k + 1]]
+            out_adj[u].add(v)
+            in_adj[v].add(u)
+            if not self.directed:
+                out_adj[v].add(u)
+                in_adj[u].add(v)
+        if self.weighted:
+            weights = state["weights"]
+            for k in range(0, len(edges), 2):
+                u = vertices[edges[k]]
+                v = vertices[edges[k + 1]]
+                key = (u, v) if self.directed else frozenset({u, v})
+                self.weights[key] = weights[k // 2]
+        self.out_adj_list = out_adj
+        self.in_adj_list = in_adj
+        self.edge_count = len(edges) // 2
+        self.version = state["version"]
+        self._transaction = None
+        self._listeners = []
+        self._connectivity = None
 
     def get_v(self):
         """
@@ -174,6 +495,59 @@ class Graph:
             raise ValueError("Vertex does not exist.")
         return list(self.in_adj_list[vertex])
 
+    def out_neighbors_view(self, vertex):
+        """
+        Return a read-only view of the outgoing neighbors (no copy).
+
+        Time complexity: O(1)
+        """
+        if vertex not in self.out_adj_list:
+            raise ValueError("Vertex does not exist.")
+        return NeighborView(self.out_adj_list[vertex])
+
+    def in_neighbors_view(self, vertex):
+        """
+        Return a read-only view of the incoming neighbors (no copy).
+
+        Time complexity: O(1)
+        """
+        if vertex not in self.in_adj_list:
+            raise ValueError("Vertex does not exist.")
+        return NeighborView(self.in_adj_list[vertex])
+
+    def all_neighbors(self, vertex):
+        """
+        Return a read-only view of every vertex adjacent to the given vertex,
+        ignoring edge direction. For undirected graphs this is the neighbor set
+        itself; for directed graphs the union is computed lazily.
+
+        Time complexity: O(1)
+        """
+        if vertex not in self.out_adj_list:
+            raise ValueError("Vertex does not exist.")
+        if not self.directed:
+            return NeighborView(self.out_adj_list[vertex])
+        return UnionNeighborView(self.out_adj_list[vertex], self.in_adj_list[vertex])
+
+    def degree(self, vertex, mode="all"):
+        """
+        Return the degree of a vertex.
+
+        mode: "out" (outgoing edges), "in" (incoming edges) or "all"
+        (number of distinct adjacent vertices, ignoring direction).
+
+        Time complexity: O(1), O(d) for mode "all" on directed graphs
+        """
+        if vertex not in self.out_adj_list:
+            raise ValueError("Vertex does not exist.")
+        if mode == "out":
+            return len(self.out_adj_list[vertex])
+        if mode == "in":
+            return len(self.in_adj_list[vertex])
+        if mode == "all":
+            return len(self.all_neighbors(vertex))
+        raise ValueError("Mode must be 'out', 'in' or 'all'.")
+
     def get_vertices(self):
         """
         Return a list of all vertices in the graph.
@@ -182,42 +556,88 @@ class Graph:
         """
         return list(self.out_adj_list.keys())
 
-    def __str__(self):
+    def iter_lines(self):
         """
-        Return a string representation of the graph.
+        Yield the graph line by line in the create_from_file format
+        (header, then one "u v" / "u v w" line per edge, and a line with just
+        the vertex for vertices without outgoing edges).
+
+        Undirected edges are emitted once, from the smaller endpoint, so no
+        set of printed edges is needed: extra memory is O(1). Labels that
+        cannot be ordered (mixed types such as 1 and "a") fall back to
+        emitting each edge from whichever endpoint comes first in
+        out_adj_list, which keeps the set of finished vertices (O(V) memory).
 
         Time complexity: O(V + E)
         """
         header = ("directed" if self.directed else "undirected") + " "
         header += ("weighted" if self.weighted else "unweighted")
-        lines = [header]
-        printed_edges = set()
-
-        if self.directed:
-            for u in self.out_adj_list:
-                if not self.out_adj_list[u]:
-                    lines.append(str(u))
-                for v in self.out_adj_list[u]:
+        yield header
+
+        weights = self.weights
+        # Vertices whose undirected edges were all emitted, only needed when
+        # u <= v cannot decide which endpoint emits an edge.
+        done = None if self.directed or self._labels_ordered() else set()
+        for u, neighbors in self.out_adj_list.items():
+            if not neighbors:
+                yield str(u)
+                continue
+            for v in neighbors:
+                if self.directed:
                     if self.weighted:
-                        weight = self.weights.get((u, v), 0)
-                        lines.append(f"{u} {v} {weight}")
+                        yield f"{u} {v} {weights.get((u, v), 0)}"
                     else:
-                        lines.append(f"{u} {v}")
-        else:
-            for u in self.out_adj_list:
-                if not self.out_adj_list[u]:
-                    lines.append(str(u))
-                for v in self.out_adj_list[u]:
-                    key = frozenset({u, v})
-                    if key in printed_edges:
-                        continue
-                    printed_edges.add(key)
+                        yield f"{u} {v}"
+                elif (u <= v) if done is None else (v not in done):
                     if self.weighted:
-                        weight = self.weights.get(key, 0)
-                        lines.append(f"{u} {v} {weight}")
+                        yield f"{u} {v} {weights.get(frozenset({u, v}), 0)}"
                     else:
-                        lines.append(f"{u} {v}")
-        return "\n".join(lines)
+                        yield f"{u} {v}"
+            if done is not None:
+                done.add(u)
+
+    def _labels_ordered(self):
+        """
+        True if all vertex labels are of one totally ordered type (str, or
+        int), so u <= v never raises TypeError.
+
+        Time complexity: O(V)
+        """
+        kind = type(next(iter(self.out_adj_list), ""))
+        if kind is not str and kind is not int:
+            return False
+        return all(type(v) is kind for v in self.out_adj_list)
+
+    def write_to_file(self, file, chunk_lines=10000):
+        """
+        Write the graph in the create_from_file format to `file` (a filename
+        or an open text file), streaming it in chunks of `chunk_lines` lines
+        instead of building the whole text in memory.
+
+        Time complexity: O(V + E)
+        """
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                self.write_to_file(f, chunk_lines)
+            return
+        chunk = []
+        for line in self.iter_lines():
+            chunk.append(line)
+            if len(chunk) >= chunk_lines:
+                chunk.append("")
+                file.write("\n".join(chunk))
+                chunk = []
+        if chunk:
+            chunk.append("")
+            file.write("\n".join(chunk))
+
+    def __str__(self):
+        """
+        Return a string representation of the graph.
+
+        Time complexity: O(V + E)
+        """
+        return "\n".join(self.iter_lines())
 
     def change_directed(self, new_directed):
         """
@@ -297,6 +717,7 @@ class Graph:
                 self.weights = new_weights
 
         self.directed = new_directed
+        self._changed("reset")
 
     def change_weighted(self, new_weighted):
         """
@@ -328,6 +749,7 @@ class Graph:
                         if key not in counted:
                             counted.add(key)
                             self.weights[key] = 0
+        self._changed("reset")
 
     def set_weight(self, u, v, weight):
         """
@@ -346,6 +768,7 @@ class Graph:
             if key not in self.weights:
                 raise ValueError("Edge does not exist.")
             self.weights[key] = weight
+        self._changed("set_weight", u, v, weight)
 
     def get_weight(self, u, v):
         """
@@ -388,38 +811,127 @@ class Graph:
         directed_flag = (first_line[0].lower() == "directed")
         weighted_flag = (first_line[1].lower() == "weighted")
         g = Graph(directed=directed_flag, weighted=weighted_flag)
+        # Collect everything first and add it with the bulk methods.
+        vertices = {}
+        edges = []
         for line in lines[1:]:
             line = line.strip()
             if not line:
                 continue
             parts = line.split()
             if len(parts) == 1:
-                vertex = parts[0]
-                if vertex not in g.out_adj_list:
-                    g.add_vertex(vertex)
+                vertices[parts[0]] = None
             elif len(parts) == 2:
                 u, v = parts
-                if u not in g.out_adj_list:
-                    g.add_vertex(u)
-                if v not in g.out_adj_list:
-                    g.add_vertex(v)
-                g.add_edge(u, v)
+                vertices[u] = None
+                vertices[v] = None
+                edges.append((u, v, 0))
             elif len(parts) == 3:
                 u, v, w = parts
-                if u not in g.out_adj_list:
-                    g.add_vertex(u)
-                if v not in g.out_adj_list:
-                    g.add_vertex(v)
+                vertices[u] = None
+                vertices[v] = None
                 try:
                     w_val = int(w)
                 except ValueError:
                     w_val = float(w)
-                g.add_edge(u, v, w_val)
+                edges.append((u, v, w_val))
             else:
                 raise ValueError("Invalid line format in file.")
+        g.add_vertices_from(vertices)
+        g.add_edges_from(edges)
         return g
 
 
+class GraphTransaction:
+    """
+    Context manager returned by Graph.transaction(). Every edit goes through
+    the normal (validated) Graph method and records how to undo itself.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._undo = []
+        self._outer = None
+
+    def __enter__(self):
+        self._outer = self.graph._transaction
+        self.graph._transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        g = self.graph
+        if exc_type is not None:
+            for undo in reversed(self._undo):
+                undo()
+        g._transaction = self._outer
+        if exc_type is None and self._undo:
+            if self._outer is not None:
+                self._outer._undo.extend(self._undo)
+            else:
+                g._changed()
+        self._undo = []
+        self._outer = None
+        return False
+
+    def _weight_of(self, u, v):
+        return self.graph.get_weight(u, v) if self.graph.weighted else 0
+
+    def add_vertex(self, vertex):
+        self.graph.add_vertex(vertex)
+        self._undo.append(lambda: self.graph.remove_vertex(vertex))
+
+    def add_vertices_from(self, vertices):
+        vertices = list(vertices)
+        self.graph.add_vertices_from(vertices)
+
+        def undo():
+            for vertex in vertices:
+                self.graph.remove_vertex(vertex)
+        self._undo.append(undo)
+
+    def add_edge(self, u, v, weight=0):
+        self.graph.add_edge(u, v, weight)
+        self._undo.append(lambda: self.graph.remove_edge(u, v))
+
+    def add_edges_from(self, edges):
+        edges = list(edges)
+        self.graph.add_edges_from(edges)
+        self._undo.append(lambda: self.graph.remove_edges_from(edges))
+
+    def remove_edge(self, u, v):
+        weight = self._weight_of(u, v) if self.graph.weighted and self.graph.is_edge(u, v) else 0
+        self.graph.remove_edge(u, v)
+        self._undo.append(lambda: self.graph.add_edge(u, v, weight))
+
+    def remove_edges_from(self, edges):
+        edges = [(edge[0], edge[1]) for edge in edges]
+        g = self.graph
+        weighted = [(u, v, self._weight_of(u, v)) if g.weighted and u in g.out_adj_list and v in g.out_adj_list[u]
+                    else (u, v, 0) for u, v in edges]
+        g.remove_edges_from(edges)
+        self._undo.append(lambda: self.graph.add_edges_from(weighted))
+
+    def remove_vertex(self, vertex):
+        g = self.graph
+        if vertex not in g.out_adj_list:
+            raise ValueError("Vertex does not exist.")
+        edges = [(vertex, v, self._weight_of(vertex, v)) for v in g.out_adj_list[vertex]]
+        if g.directed:
+            edges += [(u, vertex, self._weight_of(u, vertex)) for u in g.in_adj_list[vertex]
+                      if u != vertex]
+        g.remove_vertex(vertex)
+
+        def undo():
+            self.graph.add_vertex(vertex)
+            self.graph.add_edges_from(edges)
+        self._undo.append(undo)
+
+    def set_weight(self, u, v, weight):
+        old = self.graph.get_weight(u, v)
+        self.graph.set_weight(u, v, weight)
+        self._undo.append(lambda: self.graph.set_weight(u, v, old))
+
+
 class BFSIterator:
     """
     Breadth First Search (BFS) iterator for Graph.
@@ -427,12 +939,16 @@ class BFSIterator:
     Initialization Time complexity: O(1)
     __next__: O(1)
     Total traversal: O(V + E)
+
+    If an instrumentation object is given, "bfs.visited" is reported once
+    the traversal is exhausted.
     """
 
-    def __init__(self, graph, start):
+    def __init__(self, graph, start, instrumentation=None):
         if start not in graph.out_adj_list:
             raise ValueError("Start vertex does not exist in the graph.")
         self.graph = graph
+        self.instrumentation = get_instrumentation(instrumentation)
         self.queue = collections.deque()
         self.visited = set()
         self.queue.append((start, 0))
@@ -443,6 +959,9 @@ class BFSIterator:
 
     def __next__(self):
         if not self.queue:
+            if self.instrumentation is not None:
+                self.instrumentation.count("bfs.visited", len(self.visited))
+                self.instrumentation = None
             raise StopIteration
         vertex, dist = self.queue.popleft()
         for neighbor in self.graph.out_adj_list[vertex]:
@@ -459,12 +978,16 @@ class DFSIterator:
     Initialization Time complexity: O(1)
     __next__: O(1)
     Total traversal: O(V + E)
+
+    If an instrumentation object is given, "dfs.visited" is reported once
+    the traversal is exhausted.
     """
 
-    def __init__(self, graph, start):
+    def __init__(self, graph, start, instrumentation=None):
         if start not in graph.out_adj_list:
             raise ValueError("Start vertex does not exist in the graph.")
         self.graph = graph
+        self.instrumentation = get_instrumentation(instrumentation)
         self.stack = []
         self.visited = set()
         self.stack.append((start, 0))
@@ -482,5 +1005,8 @@ class DFSIterator:
                 if neighbor not in self.visited:
                     self.stack.append((neighbor, depth + 1))
             return (vertex, depth)
+        if self.instrumentation is not None:
+            self.instrumentation.count("dfs.visited", len(self.visited))
+            self.instrumentation = None
         raise StopIteration
 
@@ -0,0 +1,243 @@
+"""
+Fast loader for vertex positions files (CSV with the headers
+vertex_name, position_x, position_y, like Positions).
+
+The coordinates are parsed in bulk into a flat array of doubles and kept in a
+PositionTable, which behaves like the dict vertex -> (x, y) the algorithms
+expect. When a graph is given the table is laid out in the graph's vertex
+order (rows for other vertices are dropped). If a name appears on several
+rows, the last row wins.
+
+After the first load a binary sidecar (<csv>.poscache) is written next to
+the CSV; later loads read it directly as long as the CSV's size and
+modification time have not changed.
+"""
+
+import array
+import csv
+import os
+import struct
+from collections.abc import Mapping
+
+CACHE_SUFFIX = ".poscache"
+_MAGIC = b"POSCACHE"
+# magic, csv mtime (ns), csv size, number of positions, length of the names block
+_HEADER = struct.Struct("<8sqqqq")
+
+
+class PositionTable(Mapping):
+    """
+    Read-only mapping vertex name -> (x, y) backed by a flat array
+    [x0, y0, x1, y1, ...] of doubles. Duplicate names keep their last row.
+
+    Time complexity: O(1) average lookup
+    """
+
+    def __init__(self, names, coords):
+        if len(coords) != 2 * len(names):
+            raise ValueError("Coordinate array does not match the number of vertices.")
+        index = {name: i for i, name in enumerate(names)}
+        if len(index) != len(names):
+            rows = sorted(index.values())
+            names = [names[i] for i in rows]
+            coords = _select_rows(coords, rows)
+            index = {name: i for i, name in enumerate(names)}
+        self.names = names
+        self.coords = coords
+        self.index = index
+
+    def __getitem__(self, vertex):
+        i = self.index[vertex] * 2
+        return (self.coords[i], self.coords[i + 1])
+
+    def __contains__(self, vertex):
+        return vertex in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def aligned(self, vertices):
+        """
+        New table with exactly `vertices`, in that order (e.g. the vertices
+        of a graph). Raises KeyError for a vertex without a position.
+
+        Time complexity: O(n)
+        """
+        vertices = list(vertices)
+        index = self.index
+        return PositionTable(vertices, _select_rows(self.coords, [index[v] for v in vertices]))
+
+
+def _select_rows(coords, rows):
+    """
+    Coordinate array holding the given rows of coords, in that order.
+    """
+    xs = coords[0::2]
+    ys = coords[1::2]
+    out = array.array("d", bytes(16 * len(rows)))
+    out[0::2] = array.array("d", map(xs.__getitem__, rows))
+    out[1::2] = array.array("d", map(ys.__getitem__, rows))
+    return out
+
+
+def _interleave(xs, ys):
+    out = array.array("d", bytes(16 * len(xs)))
+    out[0::2] = xs
+    out[1::2] = ys
+    return out
+
+
+def _header_columns(header):
+    header = [h.strip() for h in header]
+    try:
+        return len(header), header.index("vertex_name"), header.index("position_x"), header.index("position_y")
+    except ValueError:
+        raise ValueError("Positions file must have headers: vertex_name, position_x, position_y")
+
+
+def parse_positions_csv(filename):
+    """
+    Parse the CSV into (names, coords). The columns are found by their
+    header names, so their order does not matter.
+
+    Files without quoting, blank lines or ragged rows (what Positions and the
+    generators write) are split into cells in one pass and each coordinate
+    column is converted with map() into an array('d'), without per-row
+    Python code; anything else goes through csv.reader.
+
+    Time complexity: O(n) where n is the number of rows
+    """
+    with open(filename, newline='') as csvfile:
+        text = csvfile.read()
+    if not text.strip():
+        raise ValueError("Empty positions file.")
+    if '"' not in text:
+        header, _, body = text.partition("\n")
+        width, name_col, x_col, y_col = _header_columns(header.split(","))
+        body = body.replace("\r\n", "\n")
+        rows = body.count("\n") + (1 if body and not body.endswith("\n") else 0)
+        cells = body.replace("\n", ",").split(",")
+        if body.endswith("\n"):
+            cells.pop()
+        if len(cells) == width * rows:  # otherwise blank or ragged lines
+            names = cells[name_col::width]
+            if " " in body or "\t" in body:
+                names = list(map(str.strip, names))
+            xs = array.array("d", map(float, cells[x_col::width]))
+            ys = array.array("d", map(float, cells[y_col::width]))
+            return names, _interleave(xs, ys)
+    return _parse_rows(csv.reader(text.splitlines()))
+
+
+def _parse_rows(reader):
+    """
+    Row by row parse, for files with quoted cells or ragged rows.
+    """
+    _, name_col, x_col, y_col = _header_columns(next(reader))
+    names = []
+    coords = array.array("d")
+    for row in reader:
+        if not row:
+            continue
+        names.append(row[name_col].strip())
+        coords.append(float(row[x_col]))
+        coords.append(float(row[y_col]))
+    return names, coords
+
+
+def _csv_signature(filename):
+    st = os.stat(filename)
+    return st.st_mtime_ns, st.st_size
+
+
+def read_cache(cache_file, signature):
+    """
+    Return (names, coords) from a sidecar file, or None if it is missing,
+    damaged or was written for a different version of the CSV.
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, mtime, size, count, names_len = _HEADER.unpack_from(data)
+    if magic != _MAGIC or (mtime, size) != signature:
+        return None
+    start = _HEADER.size
+    names_block = data[start:start + names_len]
+    coords = array.array("d")
+    coords.frombytes(data[start + names_len:])
+    names = names_block.decode("utf-8").split("\n") if count else []
+    if len(names) != count or len(coords) != 2 * count:
+        return None
+    return names, coords
+
+
+def write_cache(cache_file, signature, names, coords):
+    """
+    Write the sidecar atomically. Failing to write it (e.g. read-only
+    directory) is not an error, the CSV is simply parsed again next time.
+    """
+    names_block = "\n".join(names).encode("utf-8")
+    tmp_file = cache_file + ".tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, signature[0], signature[1], len(names), len(names_block)))
+            f.write(names_block)
+            f.write(coords.tobytes())
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+
+
+def load_positions(filename, graph=None, use_cache=True):
+    """
+    Load a positions CSV as a PositionTable, using (and refreshing) the binary
+    sidecar cache when use_cache is true.
+
+    If a graph is given, every one of its vertices must have a position
+    (see validate_positions) and the table holds exactly the graph's
+    vertices, in out_adj_list order.
+    """
+    signature = _csv_signature(filename)
+    cache_file = filename + CACHE_SUFFIX
+    cached = read_cache(cache_file, signature) if use_cache else None
+    if cached is None:
+        names, coords = parse_positions_csv(filename)
+        if use_cache:
+            write_cache(cache_file, signature, names, coords)
+    else:
+        names, coords = cached
+    positions = PositionTable(names, coords)
+    if graph is not None:
+        validate_positions(graph, positions)
+        positions = positions.aligned(graph.out_adj_list)
+    return positions
+
+
+def missing_positions(graph, positions):
+    """
+    Return the list of vertices of the graph that have no position.
+
+    Time complexity: O(V)
+    """
+    return [v for v in graph.out_adj_list if v not in positions]
+
+
+def validate_positions(graph, positions):
+    """
+    Raise ValueError if some vertex of the graph has no position.
+    """
+    missing = missing_positions(graph, positions)
+    if missing:
+        shown = ", ".join(str(v) for v in missing[:5])
+        more = f" and {len(missing) - 5} more" if len(missing) > 5 else ""
+        raise ValueError(f"{len(missing)} vertices have no position: {shown}{more}")
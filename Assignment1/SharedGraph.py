@@ -0,0 +1,424 @@
+"""
+Publish a frozen graph into shared memory so that worker processes can use
+it without each holding their own copy.
+
+    handle = publish_graph(g, positions)        # in the parent, once
+    ...
+    graph = attach_graph(handle.name)           # in each worker, O(1)
+    bellman_ford(graph, "A", "E")
+    greedy_best_first_search(graph, "A", "E", graph.positions)
+    ...
+    graph.close()                               # worker
+    handle.close()                              # parent, unlinks the memory
+
+The graph is stored in CSR form (offset/target arrays for outgoing and,
+for directed graphs, incoming edges), with parallel weights, positions and
+the vertex names. Vertices are numbered in sorted name order. Each worker
+decodes the names once, on its first lookup by name, into a name -> index
+dict, so later lookups are O(1) like in Graph; the adjacency and weights
+are never copied.
+
+SharedGraph is read-only and offers the read API of Graph (out_adj_list,
+in_adj_list, get_vertices, get_weight, is_edge, ...), so bellman_ford,
+greedy_best_first_search, BFSIterator, DFSIterator and kruskal_mst accept it
+directly. Vertex names must be strings (as in graphs read from files).
+"""
+
+import bisect
+import collections.abc
+import math
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+_MAGIC = 0x47524150484353  # "GRAPHCS"
+_FORMAT = 1
+# magic, format, flags, V, out entries, in entries, names bytes, edge_count
+_HEADER = struct.Struct("<8q")
+
+_DIRECTED = 1
+_WEIGHTED = 2
+_INT_WEIGHTS = 4
+_POSITIONS = 8
+
+
+def _layout(flags, n, n_out, n_in, names_len):
+    """
+    Byte offsets of every section, in order. All numeric sections are 8-byte
+    items so every section stays aligned.
+    """
+    sections = {}
+    offset = _HEADER.size
+
+    def add(name, items):
+        nonlocal offset
+        sections[name] = (offset, items)
+        offset += 8 * items
+
+    add("name_offsets", n + 1)
+    add("out_offsets", n + 1)
+    add("out_targets", n_out)
+    if flags & _WEIGHTED:
+        add("out_weights", n_out)
+    if flags & _DIRECTED:
+        add("in_offsets", n + 1)
+        add("in_targets", n_in)
+    if flags & _POSITIONS:
+        add("positions", 2 * n)
+    sections["names"] = (offset, names_len)
+    return sections, offset + names_len
+
+
+def _csr(adjacency, names, index):
+    offsets = [0]
+    targets = []
+    for name in names:
+        neighbors = sorted(index[v] for v in adjacency[name])
+        targets.extend(neighbors)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+class SharedGraphHandle:
+    """
+    Owner of a published graph. Keep it alive while workers use the graph and
+    call close() (or use it as a context manager) to free the memory.
+    """
+
+    def __init__(self, shm):
+        self.shm = shm
+        self.name = shm.name
+
+    def close(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def publish_graph(graph, positions=None, name=None):
+    """
+    Copy a graph (and optionally its positions) into a new shared memory
+    block and return its SharedGraphHandle.
+
+    Time complexity: O(V + E log d)
+    """
+    names = sorted(graph.out_adj_list)
+    if any(not isinstance(v, str) for v in names):
+        raise ValueError("Shared graphs need string vertex names.")
+    index = {v: i for i, v in enumerate(names)}
+    n = len(names)
+
+    flags = 0
+    if graph.directed:
+        flags |= _DIRECTED
+    if graph.weighted:
+        flags |= _WEIGHTED
+    if positions is not None:
+        flags |= _POSITIONS
+
+    out_offsets, out_targets = _csr(graph.out_adj_list, names, index)
+    in_offsets, in_targets = ([], [])
+    if graph.directed:
+        in_offsets, in_targets = _csr(graph.in_adj_list, names, index)
+
+    weights = []
+    if graph.weighted:
+        for i, u in enumerate(names):
+            for k in range(out_offsets[i], out_offsets[i + 1]):
+                weights.append(graph.get_weight(u, names[out_targets[k]]))
+        if all(isinstance(w, int) for w in weights):
+            flags |= _INT_WEIGHTS
+
+    encoded = [v.encode("utf-8") for v in names]
+    name_offsets = [0]
+    for b in encoded:
+        name_offsets.append(name_offsets[-1] + len(b))
+
+    sections, size = _layout(flags, n, len(out_targets), len(in_targets), name_offsets[-1])
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    try:
+        buf = shm.buf
+        _HEADER.pack_into(buf, 0, _MAGIC, _FORMAT, flags, n, len(out_targets), len(in_targets),
+                          name_offsets[-1], graph.get_e())
+
+        def fill(section, fmt, values):
+            offset, items = sections[section]
+            view = buf[offset:offset + 8 * items].cast(fmt)
+            for i, value in enumerate(values):
+                view[i] = value
+            view.release()
+
+        fill("name_offsets", "q", name_offsets)
+        fill("out_offsets", "q", out_offsets)
+        fill("out_targets", "q", out_targets)
+        if graph.weighted:
+            fill("out_weights", "d", weights)
+        if graph.directed:
+            fill("in_offsets", "q", in_offsets)
+            fill("in_targets", "q", in_targets)
+        if positions is not None:
+            coords = []
+            for v in names:
+                x, y = positions[v] if v in positions else (math.nan, math.nan)
+                coords.append(x)
+                coords.append(y)
+            fill("positions", "d", coords)
+        offset, length = sections["names"]
+        buf[offset:offset + length] = b"".join(encoded)
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return SharedGraphHandle(shm)
+
+
+class SharedNeighbors(collections.abc.Set):
+    """
+    Read-only neighbor set of one vertex of a SharedGraph (names decoded on
+    iteration, membership by binary search).
+    """
+
+    __slots__ = ("_graph", "_targets", "_start", "_end")
+
+    def __init__(self, graph, targets, start, end):
+        self._graph = graph
+        self._targets = targets
+        self._start = start
+        self._end = end
+
+    def __iter__(self):
+        name = self._graph.vertex_name
+        targets = self._targets
+        for k in range(self._start, self._end):
+            yield name(targets[k])
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __contains__(self, vertex):
+        i = self._graph.vertex_index(vertex)
+        if i is None:
+            return False
+        k = bisect.bisect_left(self._targets, i, self._start, self._end)
+        return k < self._end and self._targets[k] == i
+
+
+class SharedAdjacency(collections.abc.Mapping):
+    """
+    Read-only {vertex: SharedNeighbors} mapping over CSR offset/target arrays.
+    graph only needs n, vertex_index(name) and vertex_name(i), so it is also
+    used by ExternalGraph.MappedGraph.
+    """
+
+    def __init__(self, graph, offsets, targets):
+        self._graph = graph
+        self._offsets = offsets
+        self._targets = targets
+
+    def __getitem__(self, vertex):
+        i = self._graph.vertex_index(vertex)
+        if i is None:
+            raise KeyError(vertex)
+        return SharedNeighbors(self._graph, self._targets, self._offsets[i], self._offsets[i + 1])
+
+    def __contains__(self, vertex):
+        return self._graph.vertex_index(vertex) is not None
+
+    def __iter__(self):
+        name = self._graph.vertex_name
+        return (name(i) for i in range(self._graph.n))
+
+    def __len__(self):
+        return self._graph.n
+
+
+class _SharedPositions(collections.abc.Mapping):
+    def __init__(self, graph, coords):
+        self._graph = graph
+        self._coords = coords
+
+    def __getitem__(self, vertex):
+        i = self._graph.vertex_index(vertex)
+        if i is None or math.isnan(self._coords[2 * i]):
+            raise KeyError(vertex)
+        return (self._coords[2 * i], self._coords[2 * i + 1])
+
+    def __contains__(self, vertex):
+        i = self._graph.vertex_index(vertex)
+        return i is not None and not math.isnan(self._coords[2 * i])
+
+    def __iter__(self):
+        return (v for v in self._graph.out_adj_list if v in self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class SharedGraph:
+    """
+    Read-only graph attached to shared memory published by publish_graph.
+
+    Time complexity: O(1) to attach, O(V) for the first lookup by name
+    (decodes the names), then O(1) to find a vertex by name and O(log d) for
+    is_edge / get_weight.
+    """
+
+    def __init__(self, name):
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13 has no track argument
+            self._shm = shared_memory.SharedMemory(name=name)
+        buf = self._shm.buf
+        magic, fmt, flags, n, n_out, n_in, names_len, edge_count = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or fmt != _FORMAT:
+            self._shm.close()
+            raise ValueError("Shared memory block does not contain a graph.")
+        self.directed = bool(flags & _DIRECTED)
+        self.weighted = bool(flags & _WEIGHTED)
+        self._int_weights = bool(flags & _INT_WEIGHTS)
+        self.n = n
+        self.edge_count = edge_count
+        sections, _ = _layout(flags, n, n_out, n_in, names_len)
+        self._views = []
+
+        def view(section, fmt):
+            offset, items = sections[section]
+            v = buf[offset:offset + 8 * items].cast(fmt)
+            self._views.append(v)
+            return v
+
+        self._name_offsets = view("name_offsets", "q")
+        out_offsets = view("out_offsets", "q")
+        out_targets = view("out_targets", "q")
+        self._out_offsets, self._out_targets = out_offsets, out_targets
+        self._weights = view("out_weights", "d") if self.weighted else None
+        offset, length = sections["names"]
+        self._names = buf[offset:offset + length]
+        self._views.append(self._names)
+        self._name_list = None  # decoded names, built on first use
+        self._index = None
+
+        self.out_adj_list = SharedAdjacency(self, out_offsets, out_targets)
+        if self.directed:
+            self.in_adj_list = SharedAdjacency(self, view("in_offsets", "q"), view("in_targets", "q"))
+        else:
+            self.in_adj_list = self.out_adj_list
+        self.positions = _SharedPositions(self, view("positions", "d")) if flags & _POSITIONS else None
+
+    def close(self):
+        """
+        Detach from the shared memory (the owner unlinks it).
+        """
+        for v in self._views:
+            v.release()
+        self._views = []
+        self._shm.close()
+
+    def _decode_names(self):
+        """
+        Time complexity: O(V + total length of the names), once per process
+        """
+        names = bytes(self._names).decode("utf-8")
+        offsets = self._name_offsets
+        if len(names) == len(self._names):  # ASCII: byte offsets are character offsets
+            self._name_list = [names[offsets[i]:offsets[i + 1]] for i in range(self.n)]
+        else:
+            raw = self._names
+            self._name_list = [bytes(raw[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(self.n)]
+        self._index = {name: i for i, name in enumerate(self._name_list)}
+
+    def vertex_name(self, i):
+        if self._name_list is None:
+            self._decode_names()
+        return self._name_list[i]
+
+    def vertex_index(self, vertex):
+        """
+        Index of a vertex name, or None.
+        """
+        if not isinstance(vertex, str):
+            return None
+        if self._index is None:
+            self._decode_names()
+        return self._index.get(vertex)
+
+    def get_v(self):
+        return self.n
+
+    def get_e(self):
+        return self.edge_count
+
+    def get_vertices(self):
+        return list(self.out_adj_list)
+
+    def is_edge(self, u, v):
+        if u not in self.out_adj_list or v not in self.out_adj_list:
+            raise ValueError("One or both vertices do not exist.")
+        return v in self.out_adj_list[u]
+
+    def out_neighbors(self, vertex):
+        return list(self.out_neighbors_view(vertex))
+
+    def in_neighbors(self, vertex):
+        return list(self.in_neighbors_view(vertex))
+
+    def out_neighbors_view(self, vertex):
+        if vertex not in self.out_adj_list:
+            raise ValueError("Vertex does not exist.")
+        return self.out_adj_list[vertex]
+
+    def in_neighbors_view(self, vertex):
+        if vertex not in self.in_adj_list:
+            raise ValueError("Vertex does not exist.")
+        return self.in_adj_list[vertex]
+
+    def get_weight(self, u, v):
+        if not self.weighted:
+            raise ValueError("Graph is unweighted.")
+        i = self.vertex_index(u)
+        j = self.vertex_index(v)
+        if i is not None and j is not None:
+            start, end = self._out_offsets[i], self._out_offsets[i + 1]
+            k = bisect.bisect_left(self._out_targets, j, start, end)
+            if k < end and self._out_targets[k] == j:
+                w = self._weights[k]
+                return int(w) if self._int_weights else w
+        raise ValueError("Edge does not exist.")
+
+
+def attach_graph(name):
+    """
+    Attach to a graph published under `name` (SharedGraphHandle.name).
+    """
+    return SharedGraph(name)
+
+
+_worker_graph = {}
+
+
+def _attach_in_worker(name):
+    _worker_graph["graph"] = attach_graph(name)
+
+
+def worker_graph():
+    """
+    The SharedGraph attached by the initializer of a shared_graph_pool worker.
+    """
+    return _worker_graph["graph"]
+
+
+def shared_graph_pool(handle, workers=None):
+    """
+    ProcessPoolExecutor whose workers attach to the published graph on start.
+    Tasks get the graph with worker_graph().
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_attach_in_worker,
+                               initargs=(handle.name,))
@@ -0,0 +1,305 @@
+"""
+Whole-graph analytics computed in-process on a sparse (CSR) adjacency:
+PageRank, degree histograms / statistics and k-core decomposition.
+
+SparseAdjacency is built once from out_adj_list (and the weights) and can be
+passed to every function here instead of the graph, so several analyses
+share one conversion. Every function also accepts a Graph (or a view,
+SharedGraph, MappedGraph) directly. Results are keyed by the original
+vertex labels.
+
+NumPy is optional: when it is installed PageRank and the degree counts are
+vectorized over the CSR arrays, otherwise the same computations run in pure
+Python. SciPy is only needed for SparseAdjacency.to_scipy(). The k-core
+decomposition is the linear-time bucket algorithm of Batagelj and Zaversnik,
+which is sequential by nature and always runs in Python.
+
+    adj = SparseAdjacency(g)
+    ranks = pagerank(adj)
+    degree_histogram(adj, "in"), core_numbers(adj)
+"""
+
+import array
+import collections
+import statistics
+
+from Instrumentation import get_instrumentation
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import scipy.sparse as scipy_sparse
+except ImportError:
+    scipy_sparse = None
+
+
+class SparseAdjacency:
+    """
+    CSR form of a graph: the out-neighbors of vertex i (numbered in
+    out_adj_list order) are indices[indptr[i]:indptr[i + 1]], with edge
+    weights in data (1.0 for unweighted graphs).
+
+    Time complexity: O(V + E log d) to build
+    """
+
+    def __init__(self, graph):
+        self.directed = graph.directed
+        self.weighted = graph.weighted
+        self.vertices = list(graph.out_adj_list)
+        self.index = {v: i for i, v in enumerate(self.vertices)}
+        index = self.index
+        indptr = array.array("q", [0])
+        indices = array.array("q")
+        data = array.array("d")
+        for u in self.vertices:
+            row = sorted(index[v] for v in graph.out_adj_list[u])
+            indices.extend(row)
+            if graph.weighted:
+                data.extend(graph.get_weight(u, self.vertices[j]) for j in row)
+            indptr.append(len(indices))
+        if not graph.weighted:
+            data = array.array("d", [1.0]) * len(indices)
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self._neighbors = None
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def to_scipy(self):
+        """
+        The adjacency as a scipy.sparse.csr_matrix (needs SciPy).
+        """
+        if scipy_sparse is None:
+            raise ImportError("SciPy is not installed.")
+        n = len(self.vertices)
+        return scipy_sparse.csr_matrix((self.data, self.indices, self.indptr), shape=(n, n))
+
+    def undirected_neighbors(self):
+        """
+        For every vertex, the set of adjacent vertex numbers ignoring edge
+        direction (built on first use).
+
+        Time complexity: O(V + E)
+        """
+        if self._neighbors is None:
+            indptr, indices = self.indptr, self.indices
+            neighbors = [set(indices[indptr[i]:indptr[i + 1]]) for i in range(len(self.vertices))]
+            if self.directed:
+                for i in range(len(self.vertices)):
+                    for k in range(indptr[i], indptr[i + 1]):
+                        neighbors[indices[k]].add(i)
+            self._neighbors = neighbors
+        return self._neighbors
+
+    def degrees(self, mode="out"):
+        """
+        List of degrees in vertex order, with the modes of Graph.degree:
+        "out", "in" or "all" (distinct adjacent vertices, ignoring direction).
+
+        Time complexity: O(V + E)
+        """
+        n = len(self.vertices)
+        indptr = self.indptr
+        if mode == "out" or (mode == "in" and not self.directed):
+            if np is not None:
+                return np.diff(np.frombuffer(indptr, dtype=np.int64)).tolist()
+            return [indptr[i + 1] - indptr[i] for i in range(n)]
+        if mode == "in":
+            if np is not None:
+                return np.bincount(np.frombuffer(self.indices, dtype=np.int64), minlength=n).tolist()
+            counts = [0] * n
+            for j in self.indices:
+                counts[j] += 1
+            return counts
+        if mode == "all":
+            if not self.directed:
+                return self.degrees("out")
+            return [len(neighbors) for neighbors in self.undirected_neighbors()]
+        raise ValueError("Mode must be 'out', 'in' or 'all'.")
+
+
+def _adjacency(graph):
+    return graph if isinstance(graph, SparseAdjacency) else SparseAdjacency(graph)
+
+
+def degree_histogram(graph, mode="out"):
+    """
+    Return {degree: number of vertices with that degree}, sorted by degree.
+
+    Time complexity: O(V + E)
+    """
+    degrees = _adjacency(graph).degrees(mode)
+    if np is not None and degrees:
+        counts = np.bincount(np.asarray(degrees, dtype=np.int64))
+        return {d: int(c) for d, c in enumerate(counts.tolist()) if c}
+    return dict(sorted(collections.Counter(degrees).items()))
+
+
+def degree_stats(graph, mode="out"):
+    """
+    Return {"min", "max", "mean", "median"} of the degrees (all 0 for an
+    empty graph).
+
+    Time complexity: O(V log V + E)
+    """
+    degrees = _adjacency(graph).degrees(mode)
+    if not degrees:
+        return {"min": 0, "max": 0, "mean": 0, "median": 0}
+    return {
+        "min": min(degrees),
+        "max": max(degrees),
+        "mean": statistics.fmean(degrees),
+        "median": statistics.median(degrees),
+    }
+
+
+def pagerank(graph, damping=0.85, max_iter=100, tol=1e-6, weighted=None, instrumentation=None):
+    """
+    PageRank by power iteration. Every vertex passes its rank to its
+    out-neighbors in proportion to the edge weights (weighted=True, the
+    default for weighted graphs) or evenly; vertices without outgoing edges
+    spread their rank over all vertices. Undirected edges count both ways.
+
+    Returns {vertex: score}, the scores summing to 1. Raises ValueError if
+    the iteration has not converged (total change below V * tol) after
+    max_iter iterations.
+
+    Time complexity: O(max_iter * (V + E))
+    Counters (when instrumented): pagerank.iterations
+    """
+    inst = get_instrumentation(instrumentation)
+    adj = _adjacency(graph)
+    n = len(adj.vertices)
+    if n == 0:
+        return {}
+    if weighted is None:
+        weighted = adj.weighted
+    if weighted and any(w < 0 for w in adj.data):
+        raise ValueError("PageRank needs non-negative weights.")
+    with inst.timer("pagerank"):
+        if np is not None:
+            ranks, iterations = _pagerank_numpy(adj, damping, max_iter, tol, weighted)
+        else:
+            ranks, iterations = _pagerank_python(adj, damping, max_iter, tol, weighted)
+    inst.count("pagerank.iterations", iterations)
+    if ranks is None:
+        raise ValueError(f"PageRank did not converge in {max_iter} iterations.")
+    return dict(zip(adj.vertices, ranks))
+
+
+def _pagerank_numpy(adj, damping, max_iter, tol, weighted):
+    n = len(adj.vertices)
+    indptr = np.frombuffer(adj.indptr, dtype=np.int64)
+    indices = np.frombuffer(adj.indices, dtype=np.int64)
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    data = np.frombuffer(adj.data, dtype=np.float64) if weighted else np.ones(len(indices))
+    out_weight = np.bincount(rows, weights=data, minlength=n)
+    dangling = out_weight == 0
+    share = data / np.where(dangling, 1.0, out_weight)[rows]  # fraction of the rank per edge
+    ranks = np.full(n, 1.0 / n)
+    for iteration in range(1, max_iter + 1):
+        incoming = np.bincount(indices, weights=ranks[rows] * share, minlength=n)
+        new = damping * (incoming + ranks[dangling].sum() / n) + (1 - damping) / n
+        err = np.abs(new - ranks).sum()
+        ranks = new
+        if err < n * tol:
+            return ranks.tolist(), iteration
+    return None, max_iter
+
+
+def _pagerank_python(adj, damping, max_iter, tol, weighted):
+    n = len(adj.vertices)
+    indptr, indices, data = adj.indptr, adj.indices, adj.data
+    out_weight = []
+    for i in range(n):
+        if weighted:
+            out_weight.append(sum(data[indptr[i]:indptr[i + 1]]))
+        else:
+            out_weight.append(indptr[i + 1] - indptr[i])
+    dangling = [i for i in range(n) if out_weight[i] == 0]
+    ranks = [1.0 / n] * n
+    base = (1 - damping) / n
+    for iteration in range(1, max_iter + 1):
+        incoming = [0.0] * n
+        for i in range(n):
+            if out_weight[i] == 0:
+                continue
+            r = ranks[i] / out_weight[i]
+            for k in range(indptr[i], indptr[i + 1]):
+                incoming[indices[k]] += r * data[k] if weighted else r
+        spread = sum(ranks[i] for i in dangling) / n
+        new = [damping * (incoming[i] + spread) + base for i in range(n)]
+        err = sum(abs(a - b) for a, b in zip(new, ranks))
+        ranks = new
+        if err < n * tol:
+            return ranks, iteration
+    return None, max_iter
+
+
+def core_numbers(graph, instrumentation=None):
+    """
+    Core number of every vertex: the largest k such that the vertex belongs
+    to a subgraph in which every vertex has at least k neighbors. Edge
+    directions are ignored and self-loops are not counted.
+
+    Bucket algorithm (Batagelj-Zaversnik): vertices are kept sorted by
+    current degree in one array with the start of every degree bucket, and
+    removing the vertex of smallest degree moves each neighbor one bucket
+    down with a swap.
+
+    Time complexity: O(V + E)
+    """
+    inst = get_instrumentation(instrumentation)
+    adj = _adjacency(graph)
+    neighbors = adj.undirected_neighbors()
+    n = len(neighbors)
+    if n == 0:
+        return {}
+    with inst.timer("core_numbers"):
+        degree = [len(neighbors[i]) - (1 if i in neighbors[i] else 0) for i in range(n)]
+        max_degree = max(degree)
+        # bucket_start[d]: first position of the vertices of degree d in order
+        counts = [0] * (max_degree + 1)
+        for d in degree:
+            counts[d] += 1
+        bucket_start = [0] * (max_degree + 1)
+        total = 0
+        for d in range(max_degree + 1):
+            bucket_start[d] = total
+            total += counts[d]
+        order = [0] * n
+        position = [0] * n
+        next_slot = bucket_start[:]
+        for v in range(n):
+            position[v] = next_slot[degree[v]]
+            order[position[v]] = v
+            next_slot[degree[v]] += 1
+
+        for i in range(n):
+            v = order[i]
+            for u in neighbors[v]:
+                if degree[u] > degree[v]:
+                    du = degree[u]
+                    pu = position[u]
+                    pw = bucket_start[du]
+                    w = order[pw]
+                    if u != w:
+                        order[pu], order[pw] = w, u
+                        position[u], position[w] = pw, pu
+                    bucket_start[du] += 1
+                    degree[u] -= 1
+    return dict(zip(adj.vertices, degree))
+
+
+def k_core(graph, k):
+    """
+    Set of the vertices of the k-core (core number at least k).
+
+    Time complexity: O(V + E)
+    """
+    return {v for v, core in core_numbers(graph).items() if core >= k}
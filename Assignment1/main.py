@@ -1,30 +1,21 @@
-import time
-from Lab01 import Graph, BFSIterator, DFSIterator
-from AlgorithmComparison import compare_algorithms
-from Assignment4 import *
-from Assignment5 import *
-from Assignment6 import *
-
-import csv
+import sys
+from Lab01 import Graph
+from PositionsLoader import load_positions, missing_positions
+# The algorithms are imported on first use (see AlgorithmRegistry).
+from AlgorithmRegistry import get as algorithm
 
 def load_positions_from_csv(filename):
     """
-    Loads vertex positions from a CSV file into a dictionary.
+    Loads vertex positions from a CSV file.
 
     The CSV must have headers: vertex_name, position_x, position_y
 
     Returns:
-        A dictionary mapping vertex names (as strings) to (x, y) coordinate tuples.
+        A PositionTable mapping vertex names (as strings) to (x, y) coordinate tuples.
+        A binary cache is kept next to the CSV to make reloading fast
+        (see PositionsLoader).
     """
-    positions = {}
-    with open(filename, newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            vertex = row['vertex_name'].strip()
-            x = float(row['position_x'])
-            y = float(row['position_y'])
-            positions[vertex] = (x, y)
-    return positions
+    return load_positions(filename)
 
 def print_menu():
     print("\n--- Graph Algorithms Menu ---")
@@ -56,6 +47,7 @@ def main():
     # Create a default graph.
     # Adjust default properties as needed.
     g = Graph(directed=True, weighted=False)
+    mst_state = None
 
     while True:
         print_menu()
@@ -184,7 +176,7 @@ def main():
             start_v = input("Enter starting vertex for BFS: ").strip()
             try:
                 print("BFS traversal (vertex, distance):")
-                for vertex, dist in BFSIterator(g, start_v):
+                for vertex, dist in algorithm("bfs")(g, start_v):
                     print(f"{vertex}: distance {dist}")
             except ValueError as e:
                 print(e)
@@ -192,7 +184,7 @@ def main():
             start_v = input("Enter starting vertex for DFS: ").strip()
             try:
                 print("DFS traversal (vertex, depth):")
-                for vertex, depth in DFSIterator(g, start_v):
+                for vertex, depth in algorithm("dfs")(g, start_v):
                     print(f"{vertex}: depth {depth}")
             except ValueError as e:
                 print(e)
@@ -209,16 +201,49 @@ def main():
                 try:
                     positions = load_positions_from_csv(positions_file)
                     print(f"Loaded {len(positions)} positions.")
+                    missing = missing_positions(g, positions)
+                    if missing:
+                        print(f"Warning: {len(missing)} vertices have no position (e.g. {missing[0]}).")
                 except Exception as e:
                     print("Failed to load positions:", e)
                     continue
 
                 start = input("Start vertex: ").strip()
                 goal = input("Goal vertex: ").strip()
-                print(compare_algorithms(g, start, goal, positions))
+                trials = input("Number of trials (Enter for a single run): ").strip()
+                if not trials:
+                    print(algorithm("compare")(g, start, goal, positions))
+                    continue
+                try:
+                    trials = int(trials)
+                    workers = int(input("Worker processes (default 0 = run here): ").strip() or 0)
+                except ValueError:
+                    print("Invalid number.")
+                    continue
+                pairs = [(start, goal)]
+                extra = input("More start-goal pairs, e.g. 'A-E B-F' (Enter for none): ").split()
+                for pair in extra:
+                    if pair.count("-") != 1:
+                        print(f"Ignoring invalid pair '{pair}'.")
+                        continue
+                    pairs.append(tuple(pair.split("-")))
+                try:
+                    results = algorithm("compare_trials")(g, pairs, positions, trials, warmup=1, workers=workers)
+                    print(algorithm("format_trials")(results))
+                except ValueError as e:
+                    print(e)
         elif choice == "20":
             root = input("Enter the root vertex: ")
-            mst = kruskal_mst(g)
+            if g.directed:
+                mst = algorithm("mst")(g)
+            else:
+                # Kept up to date by the graph edits in between, so asking
+                # again after a few changes does not rerun Kruskal.
+                if mst_state is None or mst_state.graph is not g:
+                    if mst_state is not None:
+                        mst_state.close()
+                    mst_state = algorithm("maintained_mst")(g)
+                mst = mst_state.tree
             print("\nMinimum Spanning Tree (Edges with Weights):")
             for u in mst.out_adj_list:
                 for v in mst.out_adj_list[u]:
@@ -227,7 +252,10 @@ def main():
                     w = mst.get_weight(u, v)
                     print(f"{u} -- {v}  [weight = {w}]")
             try:
-                leaf_count = mst_leaf_count_kruskal(g, root)
+                if g.directed:
+                    leaf_count = algorithm("mst_leaves")(g, root)
+                else:
+                    leaf_count = mst_state.leaf_count(root)
                 print(f"Number of leaf nodes in the MST: {leaf_count}")
             except Exception as e:
                 print("Error:", e)
@@ -240,7 +268,7 @@ def main():
                 if g.directed:
                     print("This check is only valid for undirected graphs.")
                 else:
-                    result = is_homeomorphic_to_complete_or_bipartite(g)
+                    result = algorithm("homeomorphism")(g)
                     if result:
                         print("The graph is homeomorphic to a complete or complete bipartite graph.")
                     else:
@@ -249,10 +277,37 @@ def main():
                 print("Error:", e)
 
         elif choice == "23":
-            print(f"{Hamiltonian(g)}")
+            algorithm("hamiltonian_report")(g)
 
         else:
             print("Invalid choice. Please try again.")
 
+def run_batch(argv):
+    """
+    Batch mode: python main.py --batch [SCRIPT] [--graph FILE] [--time]
+    Reads commands (see BatchMode) from SCRIPT, or stdin if SCRIPT is '-' or
+    missing. Returns the process exit code (1 if any command failed).
+    """
+    import argparse
+    from BatchMode import BatchSession
+
+    parser = argparse.ArgumentParser(description="Run graph commands non-interactively.")
+    parser.add_argument("--batch", nargs="?", const="-", required=True, metavar="SCRIPT",
+                        help="file with one command per line ('-' for stdin)")
+    parser.add_argument("--graph", help="graph file to load before running the commands")
+    parser.add_argument("--time", action="store_true", help="print the time taken by each command")
+    args = parser.parse_args(argv)
+
+    graph = Graph.create_from_file(args.graph) if args.graph else None
+    session = BatchSession(graph, sys.stdout, timed=args.time)
+    if args.batch == "-":
+        errors = session.run(sys.stdin)
+    else:
+        with open(args.batch) as f:
+            errors = session.run(f)
+    return 1 if errors else 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_batch(sys.argv[1:]))
     main()